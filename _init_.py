@@ -1,14 +1,19 @@
 """
 Package for all linked list data structures
 """
-from .node import SongNode
+from .node import SongNode, SinglySongNode
 from .singly_list import SinglyLinkedList
 from .doubly_list import DoublyLinkedList
 from .circular_list import CircularLinkedList
+from .array_list import ArrayPlaylist
+from .concurrent_list import ConcurrentPlaylist
 
 __all__ = [
     'SongNode',
+    'SinglySongNode',
     'SinglyLinkedList',
     'DoublyLinkedList',
-    'CircularLinkedList'
+    'CircularLinkedList',
+    'ArrayPlaylist',
+    'ConcurrentPlaylist'
 ]
@@ -2,30 +2,54 @@
 Main GUI Application
 Connects controls, display, and data structures
 """
+import queue
+import threading
 import tkinter as tk
+from contextlib import contextmanager
 from tkinter import ttk, messagebox
-from data_structures import SinglyLinkedList, DoublyLinkedList, CircularLinkedList
-from utils.helpers import SAMPLE_SONGS
+from controller import PlaylistController
 from .controls import Controls
 from .display import Display
+from .notifier import StatusBarNotifier
 
 class PlaylistApp:
-    def __init__(self, root):
+    def __init__(self, root, backend="linked", journal=None):
         self.root = root
         self.root.title("🎵 Playlist Manager - Data Structures Simulation")
         self.root.geometry("1000x700")
         
-        # Current playlist
-        self.playlist = None
+        # Display refresh scheduling (one redraw per Tk idle cycle)
+        self.display_dirty = False
+        self.refresh_id = None
+        self.batch_depth = 0
+        
+        # Calls from worker threads, run on the Tk thread (Tk is not thread-safe)
+        self.ui_thread = threading.get_ident()
+        self.ui_calls = queue.SimpleQueue()
         
         # Create GUI
         self.setup_gui()
         
-        # Initialize with Singly Linked List
-        self.change_list_type("Singly Linked List")
+        # Initialize with Singly Linked List ("linked" nodes or "array" columns);
+        # thread-safe, so imports can append from a worker thread
+        self.controller = PlaylistController("Singly Linked List", backend, self.notifier,
+                                             journal, thread_safe=True)
+        self.controller.on_change = self.update_display
+        self.update_display()
         
-        # Add some sample songs
-        self.add_sample_songs()
+        # Restore the last session from the journal, or start with samples
+        if self.controller.recover():
+            self.controls.list_type_var.set(self.playlist.list_type)
+        else:
+            self.add_sample_songs()
+        
+        # Journal: write pending changes every second and when closing
+        if journal is not None:
+            self.root.after(1000, self.sync_journal)
+        self.root.after(50, self.run_ui_calls)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.bind("<Control-z>", self.controls.undo)
+        self.root.bind("<Control-y>", self.controls.redo)
     
     def setup_gui(self):
         """Setup the main GUI layout"""
@@ -63,149 +87,165 @@ class PlaylistApp:
             foreground="blue"
         )
         explanation.grid(row=1, column=0, columnspan=2, pady=5)
+        
+        # Status bar for messages (replaces pop-up dialogs)
+        self.notifier = StatusBarNotifier(self.root)
+        self.notifier.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E), padx=10, pady=(0, 5))
+    
+    # ---------- ACTIONS (logic lives in the controller) ----------
+    
+    @property
+    def playlist(self):
+        """Playlist currently shown"""
+        return self.controller.playlist
+    
+    def notify(self, title, message, level="info"):
+        """Show a message in the status bar (non-blocking)"""
+        self.notifier.notify(title, message, level)
     
     def add_sample_songs(self):
         """Add 3 sample songs to start"""
-        sample_songs = SAMPLE_SONGS[:3]
-        for song in sample_songs:
-            self.playlist.add_song(song["title"], song["artist"], song["duration"])
-        self.update_display()
+        self.controller.add_sample_songs(3)
     
     def change_list_type(self, list_type):
         """Change the linked list type"""
-        # Clear current playlist
-        songs = []
-        if self.playlist:
-            songs = self.playlist.get_all_songs()
-            current_song = self.playlist.current
-        
-        # Create new playlist of selected type
-        if list_type == "Singly Linked List":
-            self.playlist = SinglyLinkedList()
-        elif list_type == "Doubly Linked List":
-            self.playlist = DoublyLinkedList()
-        else:  # Circular Linked List
-            self.playlist = CircularLinkedList()
-        
-        # Re-add songs to new playlist
-        for song in songs:
-            self.playlist.add_song(song.title, song.artist, song.duration)
-        
-        # Set current song
-        if songs and current_song:
-            # Try to find the same song in new list
-            for song in self.playlist.get_all_songs():
-                if song.title == current_song.title:
-                    self.playlist.current = song
-                    break
-        
-        self.update_display()
-        
-        # Show info message
-        if list_type == "Singly Linked List":
-            info = "• Only forward navigation (next)\n• Simple pointer structure"
-        elif list_type == "Doubly Linked List":
-            info = "• Forward & backward navigation\n• Each node has next AND prev pointers"
-        else:  # Circular
-            info = "• Continuous loop navigation\n• Last node points to first\n• Infinite playlist!"
-        
-        messagebox.showinfo(f"{list_type} Activated", info)
+        with self.batch():
+            self.controller.change_list_type(list_type)
     
     def add_song(self, title, artist, duration):
         """Add a new song to playlist"""
-        if not title or not artist or not duration:
-            return
-        
-        self.playlist.add_song(title, artist, duration)
-        self.update_display()
+        self.controller.add_song(title, artist, duration)
     
     def next_song(self):
         """Move to next song"""
-        if not self.playlist or self.playlist.size == 0:
-            messagebox.showinfo("Empty", "Playlist is empty!")
-            return
-        
-        current_before = self.playlist.current.title if self.playlist.current else "None"
-        self.playlist.next_song()
-        current_after = self.playlist.current.title if self.playlist.current else "None"
-        
-        self.update_display()
-        
-        # Show movement info
-        if current_before != current_after:
-            messagebox.showinfo("Next Song", f"Moved from:\n{current_before}\n↓\nTo: {current_after}")
+        self.controller.next_song()
     
     def prev_song(self):
         """Move to previous song"""
-        if not self.playlist or self.playlist.size == 0:
-            messagebox.showinfo("Empty", "Playlist is empty!")
-            return
-        
-        if self.playlist.list_type == "Singly Linked List":
-            messagebox.showinfo("Not Supported", 
-                "⚠️ Singly Linked List cannot go backward!\n"
-                "Switch to Doubly or Circular Linked List.")
-            return
-        
-        current_before = self.playlist.current.title if self.playlist.current else "None"
-        self.playlist.prev_song()
-        current_after = self.playlist.current.title if self.playlist.current else "None"
-        
-        self.update_display()
-        
-        if current_before != current_after:
-            messagebox.showinfo("Previous Song", f"Moved from:\n{current_before}\n↓\nTo: {current_after}")
+        self.controller.prev_song()
     
     def play_current(self):
         """'Play' current song (simulation)"""
-        if not self.playlist or not self.playlist.current:
-            messagebox.showinfo("No Song", "No song to play!")
-            return
-        
-        song = self.playlist.current
-        messagebox.showinfo(
-            "Now Playing",
-            f"🎵 Playing:\n\n"
-            f"Title: {song.title}\n"
-            f"Artist: {song.artist}\n"
-            f"Duration: {song.duration}\n\n"
-            f"Playlist Type: {self.playlist.list_type}"
-        )
-        self.update_display()
+        self.controller.play_current()
+    
+    def shuffle(self, spread=False):
+        """Shuffle the playlist in place"""
+        with self.batch():
+            self.controller.shuffle(spread)
+    
+    def set_shuffle_play(self, on):
+        """Random Next on / off (playlist order is kept)"""
+        self.controller.set_shuffle_play(on)
+    
+    def search(self, prefix):
+        """Type-ahead matches for the search box"""
+        return self.controller.search(prefix)
+    
+    def play_song(self, song_id):
+        """Make a search match the current song"""
+        self.controller.play_song(song_id)
     
     def remove_current(self):
         """Remove current song"""
-        if not self.playlist or self.playlist.size == 0:
-            messagebox.showinfo("Empty", "Playlist is already empty!")
-            return
-        
-        removed_song = self.playlist.current.title if self.playlist.current else "Unknown"
-        self.playlist.remove_current()
-        
-        self.update_display()
-        messagebox.showinfo("Song Removed", f"Removed: {removed_song}")
+        self.controller.remove_current()
+    
+    def import_file(self, path):
+        """Load a song file on a worker thread (window keeps responding)"""
+        self.controller.import_in_background(path, self.in_ui)
+    
+    def save_playlist(self, path):
+        """Save the playlist to a snapshot file"""
+        self.controller.save(path)
+    
+    def open_playlist(self, path):
+        """Open a snapshot file (list type comes from the file)"""
+        if self.controller.open(path):
+            self.controls.list_type_var.set(self.playlist.list_type)
     
     def clear_playlist(self):
-        """Clear all songs"""
-        if not self.playlist or self.playlist.size == 0:
-            messagebox.showinfo("Empty", "Playlist is already empty!")
+        """Clear all songs (asks first - Undo brings them back)"""
+        if self.playlist.size and not messagebox.askyesno(
+                "Clear Playlist", "Are you sure you want to clear all songs?"):
             return
-        
-        if messagebox.askyesno("Clear Playlist", "Are you sure you want to clear all songs?"):
-            self.playlist.clear()
-            self.update_display()
-            messagebox.showinfo("Cleared", "Playlist cleared!")
+        self.controller.clear_playlist()
+    
+    def undo(self):
+        """Take back the last change (the type box follows a type change)"""
+        with self.batch():
+            self.controller.undo()
+        self.controls.list_type_var.set(self.playlist.list_type)
+    
+    def redo(self):
+        """Do the last undone change again"""
+        with self.batch():
+            self.controller.redo()
+        self.controls.list_type_var.set(self.playlist.list_type)
+    
+    def in_ui(self, function, *args):
+        """Run `function` on the Tk thread (right away if already on it)"""
+        if threading.get_ident() == self.ui_thread:
+            function(*args)
+        else:
+            self.ui_calls.put((function, args))
+    
+    def run_ui_calls(self):
+        """Run the calls queued by worker threads, then check again shortly"""
+        while True:
+            try:
+                function, args = self.ui_calls.get_nowait()
+            except queue.Empty:
+                break
+            function(*args)
+        self.root.after(50, self.run_ui_calls)
+    
+    def sync_journal(self):
+        """Flush the journal, then check again in a second"""
+        self.controller.journal.flush()
+        self.root.after(1000, self.sync_journal)
+    
+    def on_close(self):
+        """Window closed: save pending journal changes, then quit"""
+        self.controller.close()
+        self.root.destroy()
+    
+    # ---------- DISPLAY REFRESH ----------
     
     def update_display(self):
-        """Update all display elements"""
-        if not self.playlist:
+        """Mark display as out of date - redrawn once when Tk is idle"""
+        self.display_dirty = True
+        if self.batch_depth == 0 and self.refresh_id is None:
+            self.refresh_id = self.root.after_idle(self.flush_display)
+    
+    @contextmanager
+    def batch(self):
+        """Group many changes into a single redraw:
+        
+            with app.batch():
+                for song in songs:
+                    app.add_song(...)
+        """
+        self.batch_depth += 1
+        try:
+            yield self
+        finally:
+            self.batch_depth -= 1
+            if self.batch_depth == 0 and self.display_dirty:
+                self.update_display()
+    
+    def flush_display(self):
+        """Update all display elements (if anything changed)"""
+        self.refresh_id = None
+        if not self.display_dirty or not self.playlist:
             return
-        
-        # Update visualization
-        self.display.draw_linked_list(self.playlist)
-        
-        # Update now playing
-        self.display.update_now_playing(self.playlist.current)
-        
-        # Update statistics
-        self.display.update_stats(self.playlist)
+        self.display_dirty = False
+        
+        # One read lock for the whole redraw (workers may be appending)
+        with self.controller.reading():
+            # Update visualization
+            self.display.draw_linked_list(self.playlist)
+            
+            # Update now playing
+            self.display.update_now_playing(self.playlist.current)
+            
+            # Update statistics
+            self.display.update_stats(self.playlist)
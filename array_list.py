@@ -0,0 +1,641 @@
+"""
+ARRAY-BACKED PLAYLIST
+Same API as the linked lists, but no object per song:
+- Song data lives in parallel columns (titles / artists / seconds)
+- next/prev "pointers" are integer row numbers in two int arrays
+- Removed rows go on a free list and are reused by add_song
+Pick the behaviour with list_type (Singly / Doubly / Circular)
+"""
+import gc
+import random
+import struct
+import sys
+from array import array
+from .node import SongNode, parse_duration, format_duration
+from .song_index import SongIndex
+from .position_tree import PositionTree
+from .playlist_stats import PlaylistStats
+from .prefix_index import PrefixIndex
+from .shuffle import random_order, spread_artists
+
+NIL = -1    # "None" for row pointers
+LIST_TYPES = ("Singly Linked List", "Doubly Linked List", "Circular Linked List")
+
+
+class SongRef:
+    """Lightweight handle to one row - looks like a SongNode to the GUI"""
+    __slots__ = ("playlist", "index")
+
+    def __init__(self, playlist, index):
+        self.playlist = playlist
+        self.index = index
+
+    @property
+    def title(self):
+        return self.playlist.titles[self.index]
+
+    @property
+    def artist(self):
+        return self.playlist.artists[self.index]
+
+    @property
+    def seconds(self):
+        return self.playlist.seconds[self.index]
+
+    @property
+    def song_id(self):
+        return self.playlist.song_ids[self.index]
+
+    @property
+    def duration(self):
+        return format_duration(self.seconds)
+
+    @property
+    def next(self):
+        return self.playlist._ref(self.playlist._next_of(self.index))
+
+    @property
+    def prev(self):
+        if not self.playlist.two_way:
+            return None
+        return self.playlist._ref(self.playlist._prev_of(self.index))
+
+    @property
+    def is_current(self):
+        return self.index == self.playlist.cursor
+
+    def __eq__(self, other):
+        return (isinstance(other, SongRef) and other.playlist is self.playlist
+                and other.index == self.index)
+
+    def __hash__(self):
+        return hash((id(self.playlist), self.index))
+
+
+class ArrayPlaylist:
+    def __init__(self, list_type="Singly Linked List"):
+        self.list_type = list_type
+        self.two_way = list_type != "Singly Linked List"     # prev allowed?
+        self.circular = list_type == "Circular Linked List"  # wrap around?
+        self._index = SongIndex()   # id / title / artist -> row
+        self.unindexed = 0          # Mapped rows not in the index yet
+        self.positions = None       # Position tree, built when first needed
+        self.prefixes = None        # Prefix index, built on the first search
+        self.stats = PlaylistStats()  # Playtime, songs per artist, shortest / longest
+        self.clear()
+
+    @classmethod
+    def from_columns(cls, list_type, titles, artists, seconds, cursor=0, artist_counts=None):
+        """Adopt ready-made columns (e.g. mapped from a snapshot) - rows 0..n-1
+        in playlist order. No row is read until something needs it
+        (pass artist_counts = {artist: songs} to skip reading the artists)."""
+        playlist = cls(list_type)
+        size = len(seconds)
+        if size == 0:
+            return playlist
+
+        playlist.titles = titles
+        playlist.artists = artists
+        playlist.seconds = seconds
+        playlist.song_ids = array("q", range(1, size + 1))
+        playlist.next_idx = array("i", range(1, size + 1))
+        playlist.prev_idx = array("i", range(-1, size - 1))
+        playlist.next_idx[size - 1] = NIL
+        playlist.head_idx = 0
+        playlist.tail_idx = size - 1
+        playlist.cursor = cursor if 0 <= cursor < size else 0
+        playlist.size = size
+        playlist.unindexed = size   # Registered on the first lookup / change
+        playlist.stats.add_many(artists if artist_counts is None else artist_counts, seconds)
+        return playlist
+
+    @property
+    def index(self):
+        """Hash index (mapped rows are registered the first time it is used)"""
+        if self.unindexed:
+            rows = range(self.unindexed)
+            self.unindexed = 0
+            self._index.add_many(zip(self.titles, self.artists, rows))
+        return self._index
+
+    def convert_to(self, list_type):
+        """Switch behaviour in place - prev links are always kept, so this is
+        just three flags (no row is touched)"""
+        if list_type not in LIST_TYPES:
+            raise ValueError(f"Unknown list type: {list_type!r}")
+        self.list_type = list_type
+        self.two_way = list_type != "Singly Linked List"
+        self.circular = list_type == "Circular Linked List"
+        return self
+
+    # ------------------- ROW HELPERS -------------------
+
+    def _ref(self, index):
+        """Row number -> SongRef (or None)"""
+        return None if index == NIL else SongRef(self, index)
+
+    def _next_of(self, index):
+        nxt = self.next_idx[index]
+        if nxt == NIL and self.circular:
+            return self.head_idx
+        return nxt
+
+    def _prev_of(self, index):
+        prv = self.prev_idx[index]
+        if prv == NIL and self.circular:
+            return self.tail_idx
+        return prv
+
+    def _new_row(self, title, artist, seconds, song_id=None):
+        """Take a row from the free list, or grow the columns"""
+        if song_id is None:
+            song_id = self.index.new_id()
+        # seconds goes first: the unsigned column can refuse it (OverflowError),
+        # and then no column may have changed yet
+        if self.free_idx != NIL:
+            index = self.free_idx
+            self.seconds[index] = seconds
+            self.free_idx = self.next_idx[index]
+            self.titles[index] = title
+            self.artists[index] = artist
+            self.song_ids[index] = song_id
+            self.next_idx[index] = NIL
+            self.prev_idx[index] = NIL
+        else:
+            index = len(self.titles)
+            self.seconds.append(seconds)
+            self.titles.append(title)
+            self.artists.append(artist)
+            self.song_ids.append(song_id)
+            self.next_idx.append(NIL)
+            self.prev_idx.append(NIL)
+        self.index.add(song_id, title, artist, index)
+        self.stats.add(artist, seconds)
+        if self.prefixes is not None:
+            self.prefixes.add(song_id, title, artist)
+        return index
+
+    def _unlink_row(self, index):
+        """Take a row out of the chain and recycle it"""
+        nxt = self.next_idx[index]
+        prv = self.prev_idx[index]
+        if prv == NIL:
+            self.head_idx = nxt
+        else:
+            self.next_idx[prv] = nxt
+        if nxt == NIL:
+            self.tail_idx = prv
+        else:
+            self.prev_idx[nxt] = prv
+
+        if self.positions is not None:
+            self.positions.remove(self.song_ids[index])
+        self.in_order = False
+        self._free_row(index)
+        self.size -= 1
+
+    def _walk_rows(self):
+        """Every used row once, head to tail"""
+        index = self.head_idx
+        while index != NIL:
+            yield index
+            index = self.next_idx[index]
+
+    def _free_row(self, index):
+        """Give a row back (chained through next_idx)"""
+        self.index.remove(self.song_ids[index], self.titles[index], self.artists[index])
+        if self.prefixes is not None:
+            self.prefixes.remove(self.song_ids[index], self.titles[index], self.artists[index])
+        self.stats.remove(self.artists[index], self.seconds[index])
+        self.titles[index] = None
+        self.artists[index] = None
+        self.next_idx[index] = self.free_idx
+        self.free_idx = index
+
+    # ------------------- POINTER-STYLE VIEW -------------------
+
+    @property
+    def head(self):
+        return self._ref(self.head_idx)
+
+    @property
+    def tail(self):
+        return self._ref(self.tail_idx)
+
+    @property
+    def current(self):
+        return self._ref(self.cursor)
+
+    @current.setter
+    def current(self, song):
+        self.cursor = NIL if song is None else song.index
+
+    def is_playing(self, song):
+        """Is this the current song? - O(1)"""
+        return song is not None and song.index == self.cursor
+
+    # ------------------- BASIC OPERATIONS -------------------
+
+    def add_song(self, title, artist, duration):
+        """Add song to END of playlist"""
+        # 1. Fill a row
+        index = self._new_row(title, sys.intern(artist), parse_duration(duration))
+
+        # 2. Link it after the tail
+        if self.head_idx == NIL:
+            self.head_idx = index
+            self.cursor = index
+        else:
+            self.next_idx[self.tail_idx] = index
+            self.prev_idx[index] = self.tail_idx
+        self.tail_idx = index
+
+        # 3. Increase size
+        self.size += 1
+        if self.positions is not None:
+            self.positions.append(self.song_ids[index], index, self.seconds[index])
+
+        return SongRef(self, index)
+
+    def add_songs(self, songs):
+        """Add many (title, artist, duration) songs to the END in one pass"""
+        # 1. Append the new rows to the columns (free rows are left for add_song)
+        first = len(self.titles)
+        titles, artists, seconds = self.titles, self.artists, self.seconds
+        gc_was_enabled = gc.isenabled()
+        gc.disable()    # The index buckets are new objects, none of them garbage
+        try:
+            for title, artist, duration in songs:
+                # Everything that can fail first, then the three columns together
+                length, artist = parse_duration(duration), sys.intern(artist)
+                if not isinstance(title, str):
+                    raise TypeError(f"title must be a string, not {type(title).__name__}")
+                seconds.append(length)
+                titles.append(title)
+                artists.append(artist)
+        finally:
+            # 2. Chain and register them at once (rows before a bad one are kept)
+            count = len(titles) - first
+            if count:
+                self._link_rows(first, count)
+            if gc_was_enabled:
+                gc.enable()
+
+        return count
+
+    @classmethod
+    def from_iterable(cls, songs, list_type="Singly Linked List"):
+        """New playlist filled with (title, artist, duration) songs"""
+        playlist = cls(list_type)
+        playlist.add_songs(songs)
+        return playlist
+
+    def _link_rows(self, first, count):
+        """Chain new rows first .. first+count-1 after the tail"""
+        last = first + count - 1
+        rows = range(first, last + 1)
+
+        # Row i points to i+1 and back to i-1; the ends are fixed below
+        self.next_idx.extend(range(first + 1, last + 2))
+        self.prev_idx.extend(range(first - 1, last))
+        self.next_idx[last] = NIL
+        self.prev_idx[first] = self.tail_idx
+        artists = self.artists[first:]
+        self.song_ids.extend(self.index.add_many(zip(self.titles[first:], artists, rows)))
+        self.stats.add_many(artists, self.seconds[first:])
+        if self.prefixes is not None:
+            self.prefixes.add_many(zip(self.song_ids[first:], self.titles[first:], artists))
+
+        if self.head_idx == NIL:
+            self.head_idx = first
+            self.cursor = first
+        else:
+            self.next_idx[self.tail_idx] = first
+        self.tail_idx = last
+
+        self.size += count
+        if self.positions is not None:
+            for row in rows:
+                self.positions.append(self.song_ids[row], row, self.seconds[row])
+
+    def remove_current(self):
+        """Remove the currently playing song - O(1) for every type"""
+        index = self.cursor
+        if index == NIL:
+            return None
+
+        nxt = self.next_idx[index]
+        prv = self.prev_idx[index]
+
+        # 1. Unlink and recycle the row
+        self._unlink_row(index)
+
+        # 2. Move cursor the same way the linked list of this type does
+        if nxt != NIL:
+            self.cursor = nxt
+        elif self.list_type == "Doubly Linked List":
+            self.cursor = prv
+        else:
+            self.cursor = self.head_idx
+
+        return self.current
+
+    def next_song(self):
+        """Move to next song (wraps for circular)"""
+        if self.cursor != NIL:
+            nxt = self._next_of(self.cursor)
+            if nxt != NIL:
+                self.cursor = nxt
+        return self.current
+
+    def prev_song(self):
+        """Move to previous song (singly stays on the same song)"""
+        if self.cursor != NIL and self.two_way:
+            prv = self._prev_of(self.cursor)
+            if prv != NIL:
+                self.cursor = prv
+        return self.current
+
+    # ------------------- LOOKUP (HASH INDEX) -------------------
+
+    def get_song(self, song_id):
+        """Find song by its id - O(1)"""
+        row = self.index.get(song_id)
+        return None if row is None else SongRef(self, row)
+
+    def find_songs(self, title=None, artist=None):
+        """All songs with this title and/or artist (duplicates included)"""
+        return [SongRef(self, row) for row in self.index.find(title, artist)]
+
+    def jump_to(self, song_id=None, title=None, artist=None):
+        """Make a song current - by id, or the first title/artist match"""
+        if song_id is not None:
+            row = self.index.get(song_id)
+        else:
+            row = self.index.first(title, artist)
+
+        if row is not None:
+            self.cursor = row
+        return None if row is None else SongRef(self, row)
+
+    # ------------------- TYPE-AHEAD SEARCH (PREFIX INDEX) -------------------
+
+    def search(self, prefix, limit=10):
+        """Up to `limit` songs whose title or artist starts with `prefix`
+        (any case), alphabetical - O(log n + limit) once the index is built"""
+        index = self.index
+        if self.prefixes is None:
+            self.prefixes = PrefixIndex.build(
+                (self.song_ids[row], self.titles[row], self.artists[row])
+                for row in self._walk_rows())
+        return [SongRef(self, index.get(song_id))
+                for song_id in self.prefixes.search(prefix, limit)]
+
+    # ------------------- POSITIONS (O(log n)) -------------------
+
+    def _row_at(self, position):
+        """Row holding song number `position`"""
+        if self.in_order:
+            # Only appends so far: row number == position, no tree needed
+            if not 0 <= position < self.size:
+                raise IndexError(f"No song at position {position}")
+            return position
+        return self._position_tree().song_at(position)
+
+    def _position_tree(self):
+        """Position tree, built from the rows the first time it is needed"""
+        if self.positions is None:
+            self.positions = PositionTree.build(
+                (self.song_ids[row], row, self.seconds[row]) for row in self._walk_rows())
+        return self.positions
+
+    def song_at(self, position):
+        """Song number `position` (0 = head)"""
+        return SongRef(self, self._row_at(position))
+
+    def index_of(self, song):
+        """Position of `song` in the playlist (0 = head)"""
+        if self.in_order:
+            return song.index
+        return self._position_tree().index_of(song.song_id)
+
+    def insert_at(self, position, title, artist, duration):
+        """Insert a new song so it becomes number `position`"""
+        if not 0 <= position <= self.size:
+            raise IndexError(f"Cannot insert at position {position}")
+        if position == self.size:
+            return self.add_song(title, artist, duration)
+
+        # 1. Fill a row and link it just before the song now at `position`
+        #    (rows are no longer in playlist order - the tree keeps track)
+        self.in_order = False
+        after = self._position_tree().song_at(position)
+        before = self.prev_idx[after]
+        index = self._new_row(title, sys.intern(artist), parse_duration(duration))
+        self.prev_idx[index] = before
+        self.next_idx[index] = after
+        self.prev_idx[after] = index
+        if before == NIL:
+            self.head_idx = index
+        else:
+            self.next_idx[before] = index
+
+        # 2. Increase size
+        self.size += 1
+        self.positions.insert(position, self.song_ids[index], index, self.seconds[index])
+
+        return SongRef(self, index)
+
+    def remove_at(self, position):
+        """Remove song number `position` and return a copy of it"""
+        index = self._row_at(position)
+        removed = SongNode(self.titles[index], self.artists[index], self.seconds[index])
+        removed.song_id = self.song_ids[index]
+
+        # Removing the playing song moves the cursor like remove_current
+        if index == self.cursor:
+            self.remove_current()
+        else:
+            self._unlink_row(index)
+        return removed
+
+    # ------------------- PLAYTIME (O(log n)) -------------------
+
+    def song_at_time(self, seconds):
+        """(song, seconds into it) playing `seconds` after the head starts
+        (circular playlists wrap around)"""
+        tree = self._position_tree()
+        total = tree.total_seconds()
+        if self.circular and total:
+            seconds %= total
+        row, offset = tree.at_time(seconds)
+        return SongRef(self, row), offset
+
+    def time_until(self, song, start=None):
+        """Seconds from the start of `start` (default: current song) until
+        `song` starts - None if playing forward never gets there"""
+        start = self.current if start is None else start
+        tree = self._position_tree()
+        seconds = tree.time_before(song.song_id) - tree.time_before(start.song_id)
+        if tree.index_of(song.song_id) < tree.index_of(start.song_id):
+            return seconds + tree.total_seconds() if self.circular else None
+        return seconds
+
+    # ------------------- SHUFFLE -------------------
+
+    def shuffle(self, rng=random, spread=False):
+        """Put the songs in random order by rewriting next/prev rows - O(n),
+        no column is copied (spread=True: keep each artist's songs apart)"""
+        if self.size < 2:
+            return
+        if spread:
+            rows = [song.index for song in spread_artists(self.iter_songs(), rng)]
+        else:
+            rows = list(self._walk_rows())
+            rng.shuffle(rows)
+
+        for before, row in zip(rows, rows[1:]):
+            self.next_idx[before] = row
+            self.prev_idx[row] = before
+        self.prev_idx[rows[0]] = NIL
+        self.next_idx[rows[-1]] = NIL
+        self.head_idx, self.tail_idx = rows[0], rows[-1]
+        self.positions = None       # Rebuilt in the new order when needed
+        self.in_order = False
+
+    def shuffled(self, rng=random):
+        """Yield every song once in random order - links are NOT touched"""
+        for position in random_order(self.size, rng):
+            yield self.song_at(position)
+
+    # ------------------- UNDO SUPPORT (utils/history.py) -------------------
+
+    def cut(self, song_id, before_id=None):
+        """Remove a song by id and return a hole that put_back() fills again
+        (the row is recycled, so the hole keeps the song's data)"""
+        row = self.index.get(song_id)
+        before = self.prev_idx[row]
+        hole = (self.titles[row], self.artists[row], self.seconds[row], song_id,
+                None if before == NIL else self.song_ids[before])
+        if row == self.cursor:
+            self.remove_current()
+        else:
+            self._unlink_row(row)
+        return hole
+
+    def put_back(self, hole, make_current=False):
+        """Undo cut(): the song (same id) goes back after the same song - O(1)"""
+        title, artist, seconds, song_id, before_id = hole
+        before = NIL if before_id is None else self.index.get(before_id)
+        index = self._new_row(title, artist, seconds, song_id)
+        after = self.head_idx if before == NIL else self.next_idx[before]
+        self.prev_idx[index] = before
+        self.next_idx[index] = after
+        if before == NIL:
+            self.head_idx = index
+        else:
+            self.next_idx[before] = index
+        if after == NIL:
+            self.tail_idx = index
+        else:
+            self.prev_idx[after] = index
+        if self.cursor == NIL or make_current:
+            self.cursor = index
+
+        self.size += 1
+        self.in_order = False
+        if self.positions is not None:
+            position = 0 if before == NIL else self.positions.index_of(before_id) + 1
+            self.positions.insert(position, song_id, index, seconds)
+        return SongRef(self, index)
+
+    def detach_all(self):
+        """clear() in O(1) that hands the rows back for restore_all()"""
+        state = dict(vars(self))
+        self._index = SongIndex()
+        self._index.next_id = state["_index"].next_id + self.unindexed
+        self.stats = PlaylistStats()
+        self.clear()
+        return state
+
+    def restore_all(self, state):
+        """Undo detach_all() - O(1), the playlist must be empty"""
+        if not state["unindexed"]:     # Mapped rows still get ids next_id, next_id+1, ...
+            state["_index"].next_id = max(state["_index"].next_id, self._index.next_id)
+        vars(self).update(state)
+
+    # ------------------- STREAMING (NO LIST BUILT) -------------------
+
+    def iter_songs(self):
+        """Yield every song once, head to tail"""
+        for row in self._walk_rows():
+            yield SongRef(self, row)
+
+    def iter_from(self, song, count):
+        """Yield up to `count` songs starting at `song`, stopping after tail"""
+        row = NIL if song is None else song.index
+        while row != NIL and count > 0:
+            yield SongRef(self, row)
+            row = self.next_idx[row]
+            count -= 1
+
+    def iter_range(self, start, count):
+        """Yield songs number start .. start+count-1 (clipped to the list)"""
+        if count <= 0 or start >= self.size:
+            return
+        start = max(start, 0)
+        first = self.head if start == 0 else self.song_at(start)
+        yield from self.iter_from(first, count)
+
+    # ------------------- UTILITY METHODS -------------------
+
+    def get_all_songs(self):
+        """Get list of all songs (for display)"""
+        songs = list(self.iter_songs())
+
+        if self.circular and songs:
+            songs.append(f"↻ (Circular - back to: {self.titles[self.head_idx]})")
+        return songs
+
+    def clear(self):
+        """Empty the playlist (drops all columns)"""
+        self.titles = []
+        self.artists = []
+        self.seconds = array("I")
+        self.song_ids = array("q")
+        self.next_idx = array("i")
+        self.prev_idx = array("i")
+        self.free_idx = NIL
+        self.head_idx = NIL
+        self.tail_idx = NIL
+        self.cursor = NIL
+        self.size = 0
+        self.unindexed = 0
+        self.index.clear()
+        self.positions = None
+        self.prefixes = None
+        self.stats.clear()
+        self.in_order = True        # Row number == position (only appends so far)
+
+    def get_stats(self):
+        """Get statistics about playlist"""
+        return {
+            "type": self.list_type,
+            "size": self.size,
+            "current": self.titles[self.cursor] if self.cursor != NIL else "None",
+            "head": self.titles[self.head_idx] if self.head_idx != NIL else "None",
+            "tail": self.titles[self.tail_idx] if self.tail_idx != NIL else "None",
+            "node_bytes": self.row_bytes(),
+            "total_seconds": self.stats.total_seconds,
+            "artists": len(self.stats.artists),
+            "current_artist_songs":
+                self.stats.songs_by(self.artists[self.cursor]) if self.cursor != NIL else 0,
+            "shortest": self.stats.shortest,
+            "longest": self.stats.longest,
+        }
+
+    def row_bytes(self):
+        """Memory used by ONE song row (4 int columns + 2 list slots)"""
+        ints = (self.seconds.itemsize + self.song_ids.itemsize
+                + self.next_idx.itemsize + self.prev_idx.itemsize)
+        return ints + 2 * struct.calcsize("P")
@@ -0,0 +1,612 @@
+"""
+⏱ PLAYLIST BENCHMARKS
+Measures how the playlist operations scale with playlist size,
+for every list type and every backend. Plain Python - no Tk needed.
+
+Run from the project folder:
+    python benchmark.py                                  # JSON to stdout
+    python benchmark.py --sizes 1000 100000 --output results.json
+    python benchmark.py --compare baseline.json          # exit 1 on regressions
+    python benchmark.py --singly-remove                  # O(1) vs O(n) removal table
+    python benchmark.py --journal                        # journal cost + recovery time
+    python benchmark.py --stress                         # threads appending while drawing
+    python benchmark.py --server                         # load test of server.py
+    python benchmark.py --manager                        # LRU playlist cache hit rate
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from data_structures import SinglyLinkedList, ArrayPlaylist, ConcurrentPlaylist
+from controller import PlaylistController
+from manager import PlaylistManager
+from server import PlaylistClient
+from utils.helpers import new_playlist
+from utils.journal import Journal
+
+LIST_TYPES = ["Singly Linked List", "Doubly Linked List", "Circular Linked List"]
+BACKENDS = ["linked", "array"]
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+# Operations that walk the list for every call get fewer rounds on big lists
+WALK_BUDGET = 1_000_000
+
+
+def song_data(i):
+    """Generated (title, artist, seconds) for song number i"""
+    return f"Song {i}", f"Artist {i % 100}", 180 + i % 120
+
+
+def build_playlist(list_class, size):
+    """Playlist with `size` generated songs"""
+    return list_class.from_iterable(song_data(i) for i in range(size))
+
+
+def timed(function, *args):
+    """Seconds taken by one call"""
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+# ------------------- ONE OPERATION = ONE FUNCTION -------------------
+# Each returns (operations done, seconds taken) for a playlist of `size`.
+
+def op_add_song(make, size):
+    playlist = make()
+    return size, timed(lambda: [playlist.add_song(*song_data(i)) for i in range(size)])
+
+
+def op_add_songs(make, size):
+    playlist = make()
+    return size, timed(playlist.add_songs, [song_data(i) for i in range(size)])
+
+
+def _remove_rounds(size):
+    return max(1, min(1000, size // 10))
+
+
+def op_remove_head(make, size):
+    playlist = make()
+    rounds = _remove_rounds(size)
+    playlist.current = playlist.head
+    return rounds, timed(lambda: [playlist.remove_current() for _ in range(rounds)])
+
+
+def op_remove_middle(make, size):
+    playlist = make()
+    rounds = _remove_rounds(size)
+    for _ in range(size // 2):
+        playlist.next_song()
+    return rounds, timed(lambda: [playlist.remove_current() for _ in range(rounds)])
+
+
+def op_remove_tail(make, size):
+    playlist = make()
+    rounds = _remove_rounds(size)
+    if playlist.list_type == "Singly Linked List":
+        rounds = max(1, min(rounds, WALK_BUDGET // size))  # tail needs a walk
+
+    def remove_tails():
+        for _ in range(rounds):
+            playlist.current = playlist.tail
+            playlist.remove_current()
+    return rounds, timed(remove_tails)
+
+
+def op_next_sweep(make, size):
+    playlist = make()
+    playlist.current = playlist.head
+    return size - 1, timed(lambda: [playlist.next_song() for _ in range(size - 1)])
+
+
+def op_prev_sweep(make, size):
+    playlist = make()
+    playlist.current = playlist.tail
+    return size - 1, timed(lambda: [playlist.prev_song() for _ in range(size - 1)])
+
+
+def op_get_all_songs(make, size):
+    playlist = make()
+    rounds = max(1, min(100, WALK_BUDGET // size))
+    return rounds, timed(lambda: [playlist.get_all_songs() for _ in range(rounds)])
+
+
+def op_iter_songs(make, size):
+    playlist = make()
+    return size, timed(lambda: [None for _ in playlist.iter_songs()])
+
+
+def op_song_at_time(make, size):
+    playlist = make()
+    total = playlist.get_stats()["total_seconds"]
+    playlist.song_at_time(0)    # Builds the position tree (not timed)
+    points = [(i * 7919) % total for i in range(1000)]
+    return 1000, timed(lambda: [playlist.song_at_time(t) for t in points])
+
+
+def op_search_prefix(make, size):
+    playlist = make()
+    playlist.search("a")        # Builds the prefix index (not timed)
+    titles = [song.title for song in playlist.iter_range(0, 1000)]
+    prefixes = [titles[(i * 7919) % len(titles)][:2 + i % 3] for i in range(1000)]
+    return 1000, timed(lambda: [playlist.search(prefix) for prefix in prefixes])
+
+
+def op_get_stats(make, size):
+    playlist = make()
+    return 1000, timed(lambda: [playlist.get_stats() for _ in range(1000)])
+
+
+def op_clear(make, size):
+    playlist = make()
+    return 1, timed(playlist.clear)
+
+
+def op_change_list_type(make, size):
+    playlist = make()
+    backend = "array" if isinstance(playlist, ArrayPlaylist) else "linked"
+    controller = PlaylistController(playlist.list_type, backend)
+    controller.playlist = playlist
+    target = LIST_TYPES[(LIST_TYPES.index(playlist.list_type) + 1) % len(LIST_TYPES)]
+    return 1, timed(controller.change_list_type, target)
+
+
+def op_convert(make, size):
+    playlist = make()
+    start = LIST_TYPES.index(playlist.list_type)
+    # Round trip through the other two types and back
+    targets = [LIST_TYPES[(start + step) % len(LIST_TYPES)] for step in (1, 2, 3)]
+    return len(targets), timed(lambda: [playlist.convert_to(target) for target in targets])
+
+
+def op_undo_remove(make, size):
+    playlist = make()
+    controller = PlaylistController(playlist.list_type)
+    controller.playlist = playlist
+    rounds = min(1000, size)
+
+    def remove_and_undo():
+        for _ in range(rounds):
+            controller.remove_current()
+            controller.undo()
+    return rounds, timed(remove_and_undo)
+
+
+def op_undo_clear(make, size):
+    playlist = make()
+    controller = PlaylistController(playlist.list_type)
+    controller.playlist = playlist
+    return 1, timed(lambda: (controller.clear_playlist(), controller.undo()))
+
+
+def op_shuffle(make, size):
+    playlist = make()
+    return 1, timed(playlist.shuffle, random.Random(size))
+
+
+def op_shuffle_spread(make, size):
+    playlist = make()
+    return 1, timed(playlist.shuffle, random.Random(size), True)
+
+
+def op_shuffled_1000(make, size):
+    playlist = make()
+    songs = playlist.shuffled(random.Random(size))
+    next(songs)     # Builds the position tree (not timed)
+    count = min(1000, size - 1)
+    return count, timed(lambda: [next(songs) for _ in range(count)])
+
+
+OPERATIONS = {
+    "add_song": op_add_song,
+    "add_songs": op_add_songs,
+    "remove_head": op_remove_head,
+    "remove_middle": op_remove_middle,
+    "remove_tail": op_remove_tail,
+    "next_sweep": op_next_sweep,
+    "prev_sweep": op_prev_sweep,
+    "get_all_songs": op_get_all_songs,
+    "iter_songs": op_iter_songs,
+    "song_at_time": op_song_at_time,
+    "search_prefix": op_search_prefix,
+    "get_stats": op_get_stats,
+    "clear": op_clear,
+    "change_list_type": op_change_list_type,
+    "convert": op_convert,
+    "undo_remove": op_undo_remove,
+    "undo_clear": op_undo_clear,
+    "shuffle": op_shuffle,
+    "shuffle_spread": op_shuffle_spread,
+    "shuffled_1000": op_shuffled_1000,
+}
+
+
+# ------------------- SUITE -------------------
+
+def measure_memory(list_type, backend, size):
+    """Peak bytes allocated while building a playlist of `size` songs"""
+    tracemalloc.start()
+    playlist = new_playlist(list_type, backend)
+    for i in range(size):
+        playlist.add_song(*song_data(i))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def run_suite(sizes, list_types=LIST_TYPES, backends=BACKENDS, operations=OPERATIONS,
+              memory=True, log=sys.stderr):
+    """Run every operation for every (backend, type, size) - returns results dict"""
+    results = []
+    for backend in backends:
+        for list_type in list_types:
+            for size in sizes:
+                def empty():
+                    return new_playlist(list_type, backend)
+
+                def full():
+                    playlist = empty()
+                    playlist.add_songs(song_data(i) for i in range(size))
+                    return playlist
+
+                peak = measure_memory(list_type, backend, size) if memory else None
+                for name, operation in operations.items():
+                    # Adding starts from an empty playlist, the rest from a full one
+                    adding = name in ("add_song", "add_songs")
+                    count, seconds = operation(empty if adding else full, size)
+                    results.append({
+                        "backend": backend,
+                        "type": list_type,
+                        "size": size,
+                        "op": name,
+                        "count": count,
+                        "seconds": seconds,
+                        "ops_per_sec": count / seconds if seconds > 0 else float("inf"),
+                        "peak_bytes": peak,
+                    })
+                    print(f"{backend:>6} {list_type:<22} {size:>10} {name:<18} "
+                          f"{results[-1]['ops_per_sec']:>14,.0f} ops/s", file=log)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "sizes": list(sizes),
+        },
+        "results": results,
+    }
+
+
+def compare(results, baseline, threshold=0.2):
+    """Rows that got more than `threshold` slower than the baseline"""
+    key = lambda row: (row["backend"], row["type"], row["size"], row["op"])
+    before = {key(row): row for row in baseline["results"]}
+    regressions = []
+    for row in results["results"]:
+        old = before.get(key(row))
+        if old is None or not old["ops_per_sec"]:
+            continue
+        ratio = row["ops_per_sec"] / old["ops_per_sec"]
+        if ratio < 1 - threshold:
+            regressions.append(dict(row, baseline_ops_per_sec=old["ops_per_sec"], ratio=ratio))
+    return regressions
+
+
+# ------------------- SINGLY REMOVE: TRACKED vs WALK -------------------
+
+def time_skip_and_delete(size, walk_from_head=False):
+    """Average seconds per (next_song + remove_current) from mid-playlist"""
+    playlist = build_playlist(SinglyLinkedList, size)
+    for _ in range(size // 2):
+        playlist.next_song()
+
+    rounds = max(1, min(1000, size // 4))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        playlist.next_song()
+        if walk_from_head:
+            # Forget the tracked predecessor -> old O(n) search from head
+            playlist.before_current = None
+        playlist.remove_current()
+    return (time.perf_counter() - start) / rounds
+
+
+def bench_singly_remove(sizes=(1_000, 10_000, 100_000)):
+    """Singly remove_current: tracked predecessor vs walking from head"""
+    print("Singly remove_current (skip-and-delete), microseconds per op")
+    print(f"{'size':>10} {'tracked':>12} {'walk':>12}")
+    for size in sizes:
+        tracked = time_skip_and_delete(size) * 1e6
+        walk = time_skip_and_delete(size, walk_from_head=True) * 1e6
+        print(f"{size:>10} {tracked:>12.2f} {walk:>12.2f}")
+
+
+# ------------------- JOURNAL: OVERHEAD + RECOVERY -------------------
+
+def journaled_changes(controller, count):
+    """`count` changes: mostly adds, every 4th one a next"""
+    for i in range(count):
+        if i % 4 == 3:
+            controller.next_song()
+        else:
+            controller.add_song(*song_data(i))
+
+
+def bench_journal(sizes=(1_000, 10_000, 100_000), batch_sizes=(1, 64, 1024), changes=10_000):
+    """Journal cost per change (by batch size) and recovery time vs journal length"""
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "bench.journal")
+
+        print(f"Journal overhead, microseconds per change ({changes:,} changes)")
+        print(f"{'batch':>10} {'per change':>12} {'overhead':>12}")
+        plain = timed(journaled_changes, PlaylistController(), changes) / changes * 1e6
+        print(f"{'none':>10} {plain:>12.2f} {0:>12.2f}")
+        for batch_size in batch_sizes:
+            journal = Journal(path, batch_size=batch_size, checkpoint_every=float("inf"))
+            controller = PlaylistController(journal=journal)
+            seconds = timed(journaled_changes, controller, changes) + timed(controller.close)
+            cost = seconds / changes * 1e6
+            print(f"{batch_size:>10} {cost:>12.2f} {cost - plain:>12.2f}")
+            os.remove(path)
+
+        print("Recovery time vs journal length")
+        print(f"{'records':>10} {'seconds':>12} {'records/s':>12}")
+        for size in sizes:
+            journal = Journal(path, batch_size=1024, checkpoint_every=float("inf"))
+            controller = PlaylistController(journal=journal)
+            journaled_changes(controller, size)
+            controller.close()
+
+            restored = PlaylistController(journal=Journal(path))
+            seconds = timed(restored.recover)
+            print(f"{size:>10} {seconds:>12.3f} {size / seconds:>12,.0f}")
+            os.remove(path)
+
+
+# ------------------- STRESS: PRODUCER THREADS + RENDERING -------------------
+
+def render(playlist):
+    """What one redraw reads: the visible songs, now playing and the stats"""
+    with playlist.reading():
+        for song in playlist.iter_range(0, 50):
+            song.title
+        playlist.current
+        playlist.get_stats()
+
+
+def stress_round(list_type, backend, producers, seconds=2.0, batch=100):
+    """`producers` threads append in batches while this thread renders and
+    moves to the next song - returns (appends/s, render latencies, lost songs)"""
+    playlist = ConcurrentPlaylist(new_playlist(list_type, backend))
+    playlist.add_songs(song_data(i) for i in range(1000))
+    stop = threading.Event()
+    appended = [0] * producers
+
+    def produce(worker):
+        count = 0
+        while not stop.is_set():
+            first = (worker + 1) * 10_000_000 + count
+            count += playlist.add_songs(song_data(i) for i in range(first, first + batch))
+        appended[worker] = count
+
+    threads = [threading.Thread(target=produce, args=(worker,)) for worker in range(producers)]
+    for thread in threads:
+        thread.start()
+    latencies = []
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        latencies.append(timed(render, playlist))
+        playlist.next_song()
+        time.sleep(0.001)           # A GUI redraws now and then, not nonstop
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    playlist.publish()
+    lost = 1000 + sum(appended) - playlist.size
+    return sum(appended) / elapsed, sorted(latencies), lost
+
+
+def bench_stress(backends=BACKENDS, producer_counts=(0, 1, 2, 4), seconds=2.0):
+    """Append throughput and render latency with 0..N producer threads"""
+    print(f"Concurrent appends while rendering ({seconds:g} s per row)")
+    print(f"{'backend':>8} {'threads':>8} {'appends/s':>12} {'p50 ms':>8} "
+          f"{'p99 ms':>8} {'max ms':>8} {'lost':>5}")
+    for backend in backends:
+        for producers in producer_counts:
+            rate, latencies, lost = stress_round("Doubly Linked List", backend, producers, seconds)
+            p50 = latencies[len(latencies) // 2] * 1e3
+            p99 = latencies[int(len(latencies) * 0.99)] * 1e3
+            print(f"{backend:>8} {producers:>8} {rate:>12,.0f} {p50:>8.3f} "
+                  f"{p99:>8.3f} {latencies[-1] * 1e3:>8.3f} {lost:>5}")
+
+
+# ------------------- SERVER: LOAD GENERATOR -------------------
+
+SERVER_MIX = ["add", "current", "next", "list", "stats"]
+
+
+async def client_session(client, number, requests, latencies):
+    """One client sends `requests` requests, one after the other"""
+    playlist = f"user{number % 100}"        # 100 playlists shared by the clients
+    failed = 0
+    for i in range(requests):
+        op = SERVER_MIX[i % len(SERVER_MIX)]
+        fields = {"playlist": playlist}
+        if op == "add":
+            fields.update(title=f"Song {i}", artist=f"Artist {number % 50}", duration=180 + i % 120)
+        elif op == "list":
+            fields.update(offset=i % 100, limit=20)
+        start = time.perf_counter()
+        reply = await client.call(op, **fields)
+        latencies.append(time.perf_counter() - start)
+        failed += not reply["ok"]
+    return failed
+
+
+async def load_round(address, clients, requests):
+    """All clients connected first, then all send at once -
+    returns (requests/s, sorted latencies, failed requests)"""
+    connections = await asyncio.gather(*(PlaylistClient.connect(address) for _ in range(clients)))
+    latencies = []
+    start = time.perf_counter()
+    failed = await asyncio.gather(*(client_session(client, number, requests, latencies)
+                                    for number, client in enumerate(connections)))
+    elapsed = time.perf_counter() - start
+    await asyncio.gather(*(client.close() for client in connections))
+    return len(latencies) / elapsed, sorted(latencies), sum(failed)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def bench_server(client_counts=(1, 10, 100, 1000), total_requests=20_000):
+    """Requests/s and latency of server.py (its own process) vs client count"""
+    with tempfile.TemporaryDirectory() as folder:
+        if hasattr(socket, "AF_UNIX"):
+            address = os.path.join(folder, "bench.sock")
+            where = ["--socket", address]
+        else:
+            address = ("127.0.0.1", _free_port())
+            where = ["--port", str(address[1])]
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "server.py")
+        server = subprocess.Popen([sys.executable, script, *where],
+                                  stdout=subprocess.PIPE, text=True)
+        try:
+            server.stdout.readline()            # "listening on ..."
+            print(f"Server load ({total_requests:,} requests per row, mix: {', '.join(SERVER_MIX)})")
+            print(f"{'clients':>8} {'requests/s':>12} {'p50 ms':>8} {'p99 ms':>8} "
+                  f"{'max ms':>8} {'failed':>7}")
+            for clients in client_counts:
+                requests = max(1, total_requests // clients)
+                rate, latencies, failed = asyncio.run(load_round(address, clients, requests))
+                p50 = latencies[len(latencies) // 2] * 1e3
+                p99 = latencies[int(len(latencies) * 0.99)] * 1e3
+                print(f"{clients:>8} {rate:>12,.0f} {p50:>8.3f} {p99:>8.3f} "
+                      f"{latencies[-1] * 1e3:>8.3f} {failed:>7}")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+# ------------------- MANAGER: LRU EVICTION -------------------
+
+def bench_manager(playlists=100, songs=1_000, accesses=5_000, budgets=(0.1, 0.3, 0.6)):
+    """Skewed access to many playlists with room for only some of them:
+    hit rate and time per access (each access = get + next_song)"""
+    # Zipf-like popularity: playlist k is used about 1/(k+1) as often as the first
+    weights = [1 / (k + 1) for k in range(playlists)]
+    order = random.Random(1).choices(range(playlists), weights, k=accesses)
+
+    print(f"Playlist manager: {playlists} playlists x {songs:,} songs, {accesses:,} accesses")
+    print(f"{'budget':>8} {'resident':>9} {'hit rate':>9} {'evictions':>10} {'us/access':>10}")
+    for backend in BACKENDS:
+        for budget in budgets:
+            with tempfile.TemporaryDirectory() as folder:
+                manager = PlaylistManager(folder, float("inf"), backend=backend)
+                for k in range(playlists):
+                    controller = manager.get(k)
+                    controller.playlist.add_songs(song_data(i) for i in range(songs))
+                    controller.changed()
+                manager.flush()
+                for k in range(playlists):
+                    manager.evict(k)
+                manager.memory_budget = budget * PlaylistManager.estimate(backend, songs) * playlists
+                manager.hits = manager.misses = manager.evictions = 0
+
+                start = time.perf_counter()
+                for k in order:
+                    manager.get(k).next_song()
+                seconds = time.perf_counter() - start
+                stats = manager.stats()
+                print(f"{backend[:1]} {budget:>6.0%} {stats['resident']:>9} {stats['hit_rate']:>9.1%} "
+                      f"{stats['evictions']:>10,} {seconds / accesses * 1e6:>10.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Playlist data structure benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="playlist sizes (e.g. 1000 ... 10000000)")
+    parser.add_argument("--types", nargs="+", choices=["singly", "doubly", "circular"],
+                        help="list types to run (default: all)")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=BACKENDS)
+    parser.add_argument("--ops", nargs="+", choices=list(OPERATIONS),
+                        help="operations to run (default: all)")
+    parser.add_argument("--no-memory", action="store_true", help="skip peak memory pass")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown before a regression is reported (0.2 = 20%%)")
+    parser.add_argument("--singly-remove", action="store_true",
+                        help="only print the singly remove_current comparison")
+    parser.add_argument("--journal", action="store_true",
+                        help="only print journal overhead and recovery times")
+    parser.add_argument("--stress", action="store_true",
+                        help="only print append throughput / render latency with producer threads")
+    parser.add_argument("--server", action="store_true",
+                        help="only print requests/s and latency of server.py vs client count")
+    parser.add_argument("--manager", action="store_true",
+                        help="only print LRU playlist manager hit rates and access times")
+    args = parser.parse_args(argv)
+
+    if args.singly_remove:
+        bench_singly_remove(args.sizes)
+        return 0
+    if args.journal:
+        bench_journal(args.sizes)
+        return 0
+    if args.stress:
+        bench_stress(args.backends)
+        return 0
+    if args.server:
+        bench_server()
+        return 0
+    if args.manager:
+        bench_manager()
+        return 0
+
+    list_types = LIST_TYPES
+    if args.types:
+        list_types = [t for t in LIST_TYPES if t.split()[0].lower() in args.types]
+    operations = OPERATIONS
+    if args.ops:
+        operations = {name: OPERATIONS[name] for name in args.ops}
+
+    results = run_suite(args.sizes, list_types, args.backends, operations,
+                        memory=not args.no_memory)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for row in regressions:
+            print(f"REGRESSION {row['backend']} {row['type']} {row['size']} {row['op']}: "
+                  f"{row['ops_per_sec']:,.0f} ops/s vs {row['baseline_ops_per_sec']:,.0f} "
+                  f"({row['ratio']:.0%})", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,10 +15,8 @@ class CircularLinkedList(DoublyLinkedList):
     
     def add_song(self, title, artist, duration):
         """Add song and connect tail to head (circular)"""
-        from .node import SongNode
-        
         # 1. Create new node
-        new_song = SongNode(title, artist, duration)
+        new_song = self.node_class(title, artist, duration)
         
         # 2. If playlist is empty
         if self.head is None:
@@ -43,9 +41,67 @@ class CircularLinkedList(DoublyLinkedList):
         
         # 4. Increase size
         self.size += 1
+        self._song_added(new_song)
         
         return new_song
     
+    def _attach_chain(self, first, last, count):
+        """Link a ready-made chain after tail, then close the ring once"""
+        super()._attach_chain(first, last, count)
+        last.next = self.head   # ← CIRCULAR: Points to head
+        self.head.prev = last   # ← CIRCULAR: Head points back
+    
+    def remove_current(self):
+        """Remove current song and keep the ring closed"""
+        # 1. Check if empty
+        if self.current is None:
+            return None
+        removed = self.current
+        following = removed.next
+        
+        # 2. Unlink it from the ring
+        self._unlink(removed)
+        
+        # 3. Continue with the next song (ring never ends)
+        self.current = following if self.size else None
+        
+        return self.current
+    
+    def _unlink(self, song, before=None):
+        """Take `song` out of the ring"""
+        # 1. Last song left: playlist becomes empty
+        if song.next is song:
+            self.head = None
+            self.tail = None
+        else:
+            # 2. Neighbours skip over the removed song
+            song.prev.next = song.next
+            song.next.prev = song.prev
+            
+            # 3. Fix head/tail if we removed one of them
+            if song is self.head:
+                self.head = song.next
+            if song is self.tail:
+                self.tail = song.prev
+        song.next = None
+        song.prev = None
+        
+        # 4. Decrease size
+        self.size -= 1
+        self._song_removed(song)
+    
+    def _link_after(self, before, song):
+        """Hook `song` in after `before` (None = new head), ring not empty"""
+        if before is None:
+            before = self.tail      # new head sits between tail and old head
+            self.head = song
+        elif before is self.tail:
+            self.tail = song        # new tail sits between old tail and head
+        song.prev = before
+        song.next = before.next
+        before.next.prev = song
+        before.next = song
+    
     def next_song(self):
         """Always has next song (circular - never ends)"""
         if self.current:
@@ -58,6 +114,32 @@ class CircularLinkedList(DoublyLinkedList):
             self.current = self.current.prev
         return self.current
     
+    def _open_ring(self):
+        """Cut the loop: tail -> None, head -> None"""
+        if self.head is not None:
+            self.tail.next = None
+            self.head.prev = None
+    
+    def _relink(self, had_prev):
+        """Fix prev pointers, then close the ring"""
+        super()._relink(had_prev)
+        if self.head is not None:
+            self.tail.next = self.head
+            self.head.prev = self.tail
+    
+    def _before(self, song):
+        """Song just before `song` (None for head - not the tail of the ring)"""
+        return None if song is self.head else song.prev
+    
+    def song_at_time(self, seconds):
+        """Wraps around: the playlist repeats forever"""
+        total = self._position_tree().total_seconds()
+        return super().song_at_time(seconds % total if total else seconds)
+    
+    def _time_around(self, seconds):
+        """Behind the start = after the tail, one loop later"""
+        return seconds + self._position_tree().total_seconds()
+    
     # ------------------- SAFE METHOD OVERRIDE -------------------
     
     def get_all_songs(self):
@@ -72,7 +154,6 @@ class CircularLinkedList(DoublyLinkedList):
         max_songs = 20  # Safety limit
         
         while temp and count < max_songs:
-            temp.is_current = (temp == self.current)
             songs.append(temp)
             
             # Move to next
@@ -0,0 +1,272 @@
+"""
+THREAD-SAFE PLAYLIST
+Wraps any playlist (linked lists or ArrayPlaylist) so several threads can
+use it at once - e.g. ingest workers appending while the GUI draws:
+- APPENDS (add_songs / append) only take a small TAIL LOCK: songs wait in a
+  pending batch, and each full batch is linked in with one bulk add under
+  the write lock - skipped while the lock is busy, so a producer never waits
+  for a long traversal (unless it gets more than PENDING_LIMIT batches
+  ahead - then it waits, so memory stays bounded). A producer calls
+  publish() when it is done, so its last partial batch shows up too.
+- READERS (get_all_songs, get_stats, drawing, saving) share a READ lock
+- Everything that relinks nodes or moves current takes the WRITE lock,
+  so nobody ever sees a torn head / tail / size or a half-closed ring
+
+Songs handed out stay readable (title, artist, ...), but follow their
+next / prev links only inside `with playlist.reading():`.
+"""
+import threading
+from contextlib import contextmanager, nullcontext
+from .node import parse_duration
+
+PUBLISH_BATCH = 128     # Pending songs before a producer tries to link them in
+PENDING_LIMIT = 16      # ... batches before it waits until they are linked in
+
+
+class ReadWriteLock:
+    """Many readers OR one writer, taking turns: new readers wait behind a
+    waiting writer, and readers waiting when a writer finishes go before
+    the next writer (neither side starves)
+
+    A thread may nest read() in read() or write(), and write() in write();
+    asking for write() while reading raises RuntimeError (would deadlock).
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition(threading.Lock())
+        self.readers = 0
+        self.waiting_readers = 0
+        self.waiting_writers = 0
+        self.readers_turn = False       # Let the waiting readers in first
+        self.writer = None              # Thread id holding the write lock
+        self.writer_depth = 0
+        self.local = threading.local()  # Read depth of each thread
+
+    def held(self):
+        """Does this thread hold the lock (read or write)?"""
+        return self.writer == threading.get_ident() or getattr(self.local, "depth", 0) > 0
+
+    @contextmanager
+    def read(self):
+        if self.held():
+            yield                       # Nested: already safe
+            return
+        with self.condition:
+            self.waiting_readers += 1
+            while self.writer is not None or (self.waiting_writers and not self.readers_turn):
+                self.condition.wait()
+            self.waiting_readers -= 1
+            if not self.waiting_readers:
+                self.readers_turn = False
+            self.readers += 1
+        self.local.depth = 1
+        try:
+            yield
+        finally:
+            self.local.depth = 0
+            with self.condition:
+                self.readers -= 1
+                if not self.readers:
+                    self.condition.notify_all()
+
+    def acquire_write(self, blocking=True):
+        """Take the write lock - False if blocking=False and it is busy"""
+        me = threading.get_ident()
+        with self.condition:
+            if self.writer == me:
+                self.writer_depth += 1
+                return True
+            if getattr(self.local, "depth", 0):
+                raise RuntimeError("cannot write while holding the read lock")
+            if not blocking and (self.writer is not None or self.readers or self.readers_turn):
+                return False
+            self.waiting_writers += 1
+            try:
+                while self.writer is not None or self.readers or self.readers_turn:
+                    self.condition.wait()
+            finally:
+                self.waiting_writers -= 1
+            self.writer = me
+            self.writer_depth = 1
+            return True
+
+    def release_write(self):
+        with self.condition:
+            self.writer_depth -= 1
+            if not self.writer_depth:
+                self.writer = None
+                self.readers_turn = self.waiting_readers > 0
+                self.condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+# ------------------- WRAPPED METHODS -------------------
+
+def _reading(name, copy=False):
+    def method(self, *args, **kwargs):
+        with self.reading() as playlist:
+            # Lookups may build the index / position tree on first use:
+            # then only one reader at a time may run them
+            building = name in CACHED and self._caches_missing(name)
+            with self.cache_lock if building else nullcontext():
+                result = getattr(playlist, name)(*args, **kwargs)
+                return iter(list(result)) if copy else result
+    method.__name__ = name
+    method.__doc__ = (f"{name}() copied under the read lock (safe to iterate slowly)"
+                      if copy else f"{name}() under the read lock")
+    return method
+
+
+def _writing(name):
+    def method(self, *args, **kwargs):
+        with self.writing() as playlist:
+            result = getattr(playlist, name)(*args, **kwargs)
+        return self if result is playlist else result
+    method.__name__ = name
+    method.__doc__ = f"{name}() under the write lock"
+    return method
+
+
+READ_METHODS = ("get_song", "find_songs", "song_at", "index_of", "song_at_time",
+                "time_until", "is_playing", "get_all_songs", "get_stats", "search")
+LIST_METHODS = ("iter_songs", "iter_range", "iter_from", "shuffled")
+CACHED = {"get_song", "find_songs", "song_at", "index_of", "song_at_time",
+          "time_until", "iter_range", "shuffled", "search"}
+WRITE_METHODS = ("add_song", "insert_at", "remove_current", "remove_at", "next_song",
+                 "prev_song", "jump_to", "clear", "convert_to", "shuffle",
+                 "cut", "put_back", "detach_all", "restore_all")
+
+
+class ConcurrentPlaylist:
+    def __init__(self, playlist, batch_size=PUBLISH_BATCH):
+        self.playlist = playlist                # The wrapped (unsafe) playlist
+        self.lock = ReadWriteLock()             # Traversal / relinking
+        self.tail_lock = threading.Lock()       # Pending appends only
+        self.cache_lock = threading.Lock()      # Lazy index / position tree builds
+        self.pending = []                       # (title, artist, seconds) not linked yet
+        self.batch_size = batch_size
+
+    def __getattr__(self, name):
+        """Anything not wrapped below: read straight from the playlist"""
+        return getattr(self.playlist, name)
+
+    # ------------------- LOCKING -------------------
+
+    @contextmanager
+    def reading(self):
+        """Hold the read lock for several calls (e.g. one whole redraw)"""
+        with self.lock.read():
+            yield self.playlist
+
+    @contextmanager
+    def writing(self):
+        """Hold the write lock (pending songs are linked in first)"""
+        with self.lock.write():
+            self._publish()
+            yield self.playlist
+
+    def _caches_missing(self, name):
+        """Index / position tree (prefix index for search) not built yet
+        (the next lookup builds them)"""
+        playlist = self.playlist
+        built = playlist.prefixes if name == "search" else playlist.positions
+        return built is None or getattr(playlist, "unindexed", 0)
+
+    # ------------------- APPENDS (TAIL LOCK ONLY) -------------------
+
+    def add_songs(self, songs):
+        """Queue (title, artist, duration) songs at the end - returns how many
+
+        Durations are checked here (songs before a bad one are kept); the
+        songs show up once their batch is linked in (or at publish()).
+        """
+        batch = []
+        try:
+            for title, artist, duration in songs:
+                batch.append((title, artist, parse_duration(duration)))
+        finally:
+            with self.tail_lock:
+                self.pending.extend(batch)
+                pending = len(self.pending)
+            if pending >= self.batch_size * PENDING_LIMIT:
+                self.publish()                  # Too far ahead: wait for the lock
+            elif pending >= self.batch_size:
+                self.publish(blocking=False)    # Busy? The next append tries again
+        return len(batch)
+
+    def append(self, title, artist, duration):
+        """Queue one song at the end (see add_songs)"""
+        self.add_songs(((title, artist, duration),))
+
+    def publish(self, blocking=True):
+        """Link all pending songs in - False if blocking=False and it is busy
+
+        One bulk add per batch, each under its own write lock: readers
+        waiting in between get their turn, so a big import never holds
+        them up for long.
+        """
+        left = len(self.pending)        # Not the songs queued meanwhile (could go on forever)
+        while left > 0:
+            if not self.lock.acquire_write(blocking):
+                return False
+            try:
+                linked = self._publish(min(left, self.batch_size))
+            finally:
+                self.lock.release_write()
+            left = min(left - linked, len(self.pending)) if linked else 0
+        return True
+
+    def _publish(self, limit=None):
+        """Link in up to `limit` pending songs (all if None) - write lock held"""
+        with self.tail_lock:
+            if limit is None or len(self.pending) <= limit:
+                batch, self.pending = self.pending, []
+            else:
+                batch = self.pending[:limit]
+                del self.pending[:limit]
+        if batch:
+            self.playlist.add_songs(batch)
+        return len(batch)
+
+    # ------------------- POINTER-STYLE VIEW -------------------
+
+    @property
+    def size(self):
+        """Songs linked in (pending appends not counted yet)"""
+        return self.playlist.size
+
+    @property
+    def head(self):
+        with self.reading() as playlist:
+            return playlist.head
+
+    @property
+    def tail(self):
+        with self.reading() as playlist:
+            return playlist.tail
+
+    @property
+    def current(self):
+        with self.reading() as playlist:
+            return playlist.current
+
+    @current.setter
+    def current(self, song):
+        with self.writing() as playlist:
+            playlist.current = song
+
+
+for _name in READ_METHODS:
+    setattr(ConcurrentPlaylist, _name, _reading(_name))
+for _name in LIST_METHODS:
+    setattr(ConcurrentPlaylist, _name, _reading(_name, copy=True))
+for _name in WRITE_METHODS:
+    setattr(ConcurrentPlaylist, _name, _writing(_name))
+del _name
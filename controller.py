@@ -0,0 +1,523 @@
+"""
+PLAYLIST CONTROLLER (NO GUI NEEDED)
+All playlist actions in one place. Instead of popping up dialogs,
+every action sends a short message to a NOTIFIER:
+- GUI:       status bar at the bottom of the window (gui/notifier.py)
+- Headless:  LoggingNotifier (log lines) or NullNotifier (silent)
+With a JOURNAL (utils/journal.py) every change is also written to disk
+and replayed by recover() after a restart or crash.
+Add / remove / clear / type changes can be undone (utils/history.py).
+With thread_safe=True the playlist is a ConcurrentPlaylist: worker threads
+may append songs (import_in_background) while the GUI thread reads.
+"""
+import logging
+import os
+import random
+import threading
+from contextlib import nullcontext
+from data_structures import ConcurrentPlaylist
+from data_structures.node import parse_duration
+from data_structures.shuffle import random_order
+from utils.helpers import SAMPLE_SONGS, format_time, new_playlist
+from utils.history import History, AddSong, RemoveSong, ClearAll, ChangeType
+from utils.importer import CHUNK_SIZE, import_steps
+from utils.snapshot import save_snapshot, load_snapshot
+
+LIST_INFO = {
+    "Singly Linked List": "Only forward navigation (next) • Simple pointer structure",
+    "Doubly Linked List": "Forward & backward navigation • Each node has next AND prev pointers",
+    "Circular Linked List": "Continuous loop navigation • Last node points to first • Infinite playlist!",
+}
+
+
+class NullNotifier:
+    """Drops every message (benchmarks, tests)"""
+
+    def notify(self, title, message, level="info"):
+        pass
+
+
+class LoggingNotifier:
+    """Writes every message to a logger (headless runs)"""
+
+    LEVELS = {"info": logging.INFO, "warning": logging.WARNING, "error": logging.ERROR}
+
+    def __init__(self, logger=None):
+        self.logger = logger or logging.getLogger("playlist")
+
+    def notify(self, title, message, level="info"):
+        self.logger.log(self.LEVELS.get(level, logging.INFO), "%s: %s", title, message)
+
+
+class PlaylistController:
+    def __init__(self, list_type="Singly Linked List", backend="linked", notifier=None,
+                 journal=None, history=None, thread_safe=False):
+        self.thread_safe = thread_safe              # Wrap every playlist in a ConcurrentPlaylist
+        self.playlist = None
+        self.backend = backend                      # "linked" or "array"
+        self.notifier = notifier or NullNotifier()
+        self.on_change = None                       # Called after every change
+        self.journal = None
+        self.history = history or History()         # Undo / redo steps
+        self.shuffle_order = None                   # Shuffle play: positions still to play
+        self.shuffle_size = 0                       # ... drawn for a playlist this long
+
+        self.change_list_type(list_type)
+        self.journal = journal                      # Set after: the start is not a change
+
+    # ------------------- HELPERS -------------------
+
+    def notify(self, title, message, level="info"):
+        """Send a message to whoever is listening (never blocks)"""
+        self.notifier.notify(title, message, level)
+
+    def changed(self):
+        """Tell the view that the playlist changed"""
+        if self.on_change is not None:
+            self.on_change()
+
+    def current_title(self):
+        return self.playlist.current.title if self.playlist.current else "None"
+
+    @property
+    def playlist(self):
+        return self._playlist
+
+    @playlist.setter
+    def playlist(self, playlist):
+        if self.thread_safe and playlist is not None:
+            playlist = ConcurrentPlaylist(playlist)
+        self._playlist = playlist
+
+    def reading(self):
+        """The bare playlist, held still for several reads (draw, save)"""
+        if self.thread_safe:
+            return self.playlist.reading()
+        return nullcontext(self.playlist)
+
+    def writing(self):
+        """The bare playlist, nobody else reading or writing it"""
+        if self.thread_safe:
+            return self.playlist.writing()
+        return nullcontext(self.playlist)
+
+    # ------------------- JOURNAL -------------------
+
+    def record(self, op, *args):
+        """Write one change to the journal (compacted when it gets long)"""
+        self.record_all([(op, *args)])
+
+    def record_all(self, changes):
+        """Write several (op, *args) changes, then compact at most once: a
+        checkpoint between them would hold the later ones already"""
+        if self.journal is None:
+            return
+        for op, *args in changes:
+            self.journal.record(op, *args)
+        if self.journal.needs_checkpoint():
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Save the whole playlist and empty the journal"""
+        if self.journal is None:
+            return
+        # Replay starts at the checkpoint - older steps could not be undone there
+        self.history.clear()
+        try:
+            with self.reading() as playlist:
+                self.journal.checkpoint(playlist)
+        except (OSError, ValueError, OverflowError) as e:     # Disk full, or a song the file cannot hold
+            self.notify("Journal Error", f"Checkpoint failed: {e}", "error")
+
+    def recover(self):
+        """Load the last checkpoint and replay the journal after it
+        Returns True if anything was restored."""
+        journal, notifier = self.journal, self.notifier
+        if journal is None:
+            return False
+
+        # Replay quietly, and without writing the changes a second time
+        self.journal, self.notifier = None, NullNotifier()
+        actions = {
+            "add": self.add_song,
+            "remove": self.remove_current,
+            "clear": self.clear_playlist,
+            "next": self.next_song,
+            "prev": self.prev_song,
+            "type": self.change_list_type,
+            "seek": self.seek,
+            "shuffle": self.shuffle,
+            "play": self.play_at,
+            "undo": self.undo,
+            "redo": self.redo,
+        }
+        replayed = 0
+        error = None
+        try:
+            checkpoint, records = journal.replay()
+            if checkpoint is not None:
+                self.playlist = load_snapshot(checkpoint, self.backend)
+                self.history.clear()
+            for op, *args in records:
+                actions[op](*args)
+                replayed += 1
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            error = e
+        finally:
+            self.journal, self.notifier = journal, notifier
+
+        self.changed()
+        if error is not None:
+            self.notify("Recovery Incomplete",
+                        f"Stopped after {replayed:,} changes: {error}", "error")
+        elif checkpoint is not None or replayed:
+            self.notify("Recovered", f"{self.playlist.size:,} songs "
+                        f"(checkpoint + {replayed:,} changes)")
+        return checkpoint is not None or replayed > 0
+
+    def close(self):
+        """Flush the journal (call before exiting)"""
+        if self.journal is not None:
+            self.journal.close()
+
+    # ------------------- ACTIONS -------------------
+
+    def change_list_type(self, list_type):
+        """Change the linked list type (songs and current song are kept)
+        Raises ValueError for an unknown type (nothing is changed)."""
+        if list_type not in LIST_INFO:
+            raise ValueError(f"Unknown list type: {list_type!r}")
+        if self.playlist is None:
+            self.playlist = new_playlist(list_type, self.backend)
+        elif list_type != self.playlist.list_type:
+            # Same nodes / rows, relinked in place - nothing is copied
+            old_type = self.playlist.list_type
+            self.playlist.convert_to(list_type)
+            self.history.push(ChangeType(old_type, list_type))
+
+        self.changed()
+        self.record("type", list_type)
+        self.notify(f"{list_type} Activated", LIST_INFO[list_type])
+
+    def add_song(self, title, artist, duration):
+        """Add a new song (raises ValueError for a bad duration)"""
+        if not title or not artist or not duration:
+            return None
+
+        # Under one lock: a worker's append must not slip in between
+        with self.writing() as playlist:
+            tail = playlist.tail
+            song = playlist.add_song(title, artist, duration)
+        self.history.push(AddSong(song.song_id, tail.song_id if tail else None))
+        self.changed()
+        self.record("add", song.title, song.artist, song.seconds)
+        return song
+
+    def add_sample_songs(self, count=3):
+        """Add the first `count` sample songs"""
+        self.history.clear()
+        with self.writing() as playlist:
+            playlist.add_songs((song["title"], song["artist"], song["duration"])
+                               for song in SAMPLE_SONGS[:count])
+        self.changed()
+        self.record_all(("add", song["title"], song["artist"], song["duration"])
+                        for song in SAMPLE_SONGS[:count])
+
+    def import_steps(self, path, chunk_size=CHUNK_SIZE):
+        """Import a CSV / JSONL / M3U file one chunk per step (a generator)
+
+        The GUI runs one step per Tk callback; import_file runs them all.
+        """
+        self.history.clear()        # Bulk changes are not undone song by song
+        try:
+            for added, skipped, fraction in import_steps(self.playlist, path,
+                                                         chunk_size=chunk_size):
+                self._import_progress(added, fraction)
+                yield added
+        except (OSError, ValueError) as e:
+            self._link_pending()
+            self._import_failed(e)
+            return
+        self._link_pending()
+        self._import_done(path, added, skipped)
+
+    def import_in_background(self, path, run_later, chunk_size=CHUNK_SIZE):
+        """Import on a worker thread (needs thread_safe=True) - returns the thread
+
+        The worker only appends songs; progress, the checkpoint and the
+        messages are handed to `run_later(function, *args)`, e.g. the GUI's
+        way of running something on the Tk thread.
+        """
+        self.history.clear()
+        playlist = self.playlist
+
+        def work():
+            added = skipped = 0
+            try:
+                for added, skipped, fraction in import_steps(playlist, path,
+                                                             chunk_size=chunk_size):
+                    run_later(self._import_progress, added, fraction)
+            except (OSError, ValueError) as e:
+                playlist.publish()          # Keep the songs that did get in
+                run_later(self._import_failed, e)
+                return
+            playlist.publish()              # The last, partly filled batch
+            run_later(self._import_done, path, added, skipped)
+
+        thread = threading.Thread(target=work, name="import", daemon=True)
+        thread.start()
+        return thread
+
+    def _link_pending(self):
+        """Thread-safe playlist: link in the songs of the last, partly filled batch"""
+        if self.thread_safe:
+            self.playlist.publish()
+
+    def _import_progress(self, added, fraction):
+        self.changed()
+        self.notify("Importing", f"{added:,} songs ({fraction:.0%})")
+
+    def _import_failed(self, error):
+        self.changed()
+        self.checkpoint()       # Keep the songs that did get in
+        self.notify("Import Failed", str(error), "error")
+
+    def _import_done(self, path, added, skipped):
+        # One checkpoint instead of a journal line per imported song
+        self.checkpoint()
+        message = f"Added {added:,} songs from {os.path.basename(path)}"
+        if skipped:
+            message += f" (skipped {skipped:,} bad rows)"
+        self.notify("Import Done", message)
+
+    def import_file(self, path):
+        """Import a whole song file - returns the number of songs added"""
+        added = 0
+        for added in self.import_steps(path):
+            pass
+        return added
+
+    def save(self, path):
+        """Save the playlist to a snapshot file"""
+        try:
+            with self.reading() as playlist:
+                count = save_snapshot(playlist, path)
+        except (OSError, ValueError, OverflowError) as e:
+            self.notify("Save Failed", str(e), "error")
+            return False
+        self.notify("Playlist Saved", f"Saved {count:,} songs to {os.path.basename(path)}")
+        return True
+
+    def open(self, path):
+        """Replace the playlist with one saved in a snapshot file"""
+        try:
+            self.playlist = load_snapshot(path, self.backend)
+        except (OSError, ValueError) as e:
+            self.notify("Open Failed", str(e), "error")
+            return None
+        self.history.clear()
+        self.changed()
+        self.checkpoint()
+        self.notify("Playlist Opened", f"{self.playlist.size:,} songs "
+                    f"({self.playlist.list_type}) from {os.path.basename(path)}")
+        return self.playlist
+
+    def next_song(self):
+        """Move to next song (a random unplayed one in shuffle play)"""
+        if self.playlist.size == 0:
+            self.notify("Empty", "Playlist is empty!", "warning")
+            return None
+        if self.shuffle_order is not None:
+            return self._next_shuffled()
+
+        current_before = self.current_title()
+        self.playlist.next_song()
+        current_after = self.current_title()
+        self.changed()
+        self.record("next")
+
+        # Show movement info
+        if current_before != current_after:
+            self.notify("Next Song", f"Moved from {current_before} → {current_after}")
+        return self.playlist.current
+
+    def prev_song(self):
+        """Move to previous song"""
+        if self.playlist.size == 0:
+            self.notify("Empty", "Playlist is empty!", "warning")
+            return None
+
+        if self.playlist.list_type == "Singly Linked List":
+            self.notify("Not Supported",
+                        "⚠️ Singly Linked List cannot go backward! "
+                        "Switch to Doubly or Circular Linked List.", "warning")
+            return self.playlist.current
+
+        current_before = self.current_title()
+        self.playlist.prev_song()
+        current_after = self.current_title()
+        self.changed()
+        self.record("prev")
+
+        if current_before != current_after:
+            self.notify("Previous Song", f"Moved from {current_before} → {current_after}")
+        return self.playlist.current
+
+    def seek(self, seconds):
+        """Jump to the song playing `seconds` (or "h:mm:ss") after the first
+        one starts - circular playlists wrap around"""
+        seconds = parse_duration(seconds)
+        try:
+            song, offset = self.playlist.song_at_time(seconds)
+        except IndexError:
+            self.notify("Seek", f"Playlist is shorter than {format_time(seconds)}", "warning")
+            return None
+
+        self.playlist.current = song
+        self.changed()
+        self.record("seek", seconds)
+        self.notify("Seek", f"{format_time(seconds)} → {song.title} ({format_time(offset)} in)")
+        return song
+
+    def play_at(self, position):
+        """Make song number `position` current"""
+        song = self.playlist.song_at(position)
+        self.playlist.current = song
+        self.changed()
+        self.record("play", position)
+        return song
+
+    def search(self, prefix, limit=10):
+        """Songs whose title or artist starts with `prefix` (type-ahead)"""
+        prefix = prefix.strip()
+        if not prefix:
+            return []
+        return self.playlist.search(prefix, limit)
+
+    def play_song(self, song_id):
+        """Make the song with this id current (e.g. a search match)"""
+        song = self.playlist.get_song(song_id)
+        if song is None:
+            self.notify("Not Found", "That song is no longer in the playlist", "warning")
+            return None
+
+        # Journaled by position: ids are given out again after a reload
+        song = self.play_at(self.playlist.index_of(song))
+        self.notify("Now Current", f"{song.title} - {song.artist}")
+        return song
+
+    def play_current(self):
+        """'Play' current song (simulation)"""
+        song = self.playlist.current
+        if not song:
+            self.notify("No Song", "No song to play!", "warning")
+            return None
+
+        self.notify("Now Playing",
+                    f"🎵 {song.title} - {song.artist} ({song.duration}) "
+                    f"on {self.playlist.list_type}")
+        return song
+
+    def remove_current(self):
+        """Remove current song"""
+        if self.playlist.size == 0:
+            self.notify("Empty", "Playlist is already empty!", "warning")
+            return None
+
+        removed_song = self.current_title()
+        song_id = self.playlist.current.song_id
+        self.history.push(RemoveSong(song_id, self.playlist.cut(song_id)))
+        self.changed()
+        self.record("remove")
+        self.notify("Song Removed", f"Removed: {removed_song}")
+        return self.playlist.current
+
+    def clear_playlist(self):
+        """Clear all songs (no confirmation - the GUI asks first)"""
+        if self.playlist.size == 0:
+            self.notify("Empty", "Playlist is already empty!", "warning")
+            return
+
+        # Detached, not freed: Undo brings the whole list back in O(1)
+        size = self.playlist.size
+        kept = self.history.push(ClearAll(self.playlist.detach_all(), size))
+        self.changed()
+        self.record("clear")
+        self.notify("Cleared", "Playlist cleared!" if kept else
+                    f"Playlist cleared! ({size:,} songs are too many to undo)")
+
+    # ------------------- UNDO / REDO -------------------
+
+    def undo(self):
+        """Take back the last add / remove / clear / type change"""
+        step = self.history.undo(self.playlist)
+        if step is None:
+            self.notify("Undo", "Nothing to undo", "warning")
+            return None
+        self.changed()
+        self.record("undo")
+        self.notify("Undo", f"Undid: {step.label}")
+        return step
+
+    def redo(self):
+        """Do the last undone change again"""
+        step = self.history.redo(self.playlist)
+        if step is None:
+            self.notify("Redo", "Nothing to redo", "warning")
+            return None
+        self.changed()
+        self.record("redo")
+        self.notify("Redo", f"Redid: {step.label}")
+        return step
+
+    # ------------------- SHUFFLE -------------------
+
+    def shuffle(self, spread=False, seed=None):
+        """Shuffle the playlist in place (spread=True: keep artists apart)
+
+        The seed goes into the journal, so replaying gives the same order.
+        """
+        if self.playlist.size < 2:
+            self.notify("Shuffle", "Add at least two songs to shuffle!", "warning")
+            return
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.history.clear()        # Steps before it point at the old order
+        self.playlist.shuffle(random.Random(seed), spread)
+        self.changed()
+        self.record("shuffle", spread, seed)
+        self.notify("Shuffled", f"{self.playlist.size:,} songs in a new order"
+                    + (" (artists spread out)" if spread else ""))
+
+    def set_shuffle_play(self, on):
+        """Shuffle play: Next picks a random song not played yet this round,
+        the playlist itself keeps its order"""
+        self.shuffle_order = None
+        if on:
+            self._new_shuffle_round()
+        self.notify("Shuffle Play", "On - Next picks a random song" if on else "Off")
+
+    def _new_shuffle_round(self):
+        self.shuffle_order = random_order(self.playlist.size)
+        self.shuffle_size = self.playlist.size
+
+    def _draw_position(self):
+        """Next position of the shuffle round (a new round once all have
+        played, or when songs were added / removed)"""
+        position = None
+        if self.shuffle_size == self.playlist.size:
+            position = next(self.shuffle_order, None)
+        if position is None:
+            self._new_shuffle_round()
+            position = next(self.shuffle_order)
+        return position
+
+    def _next_shuffled(self):
+        position = self._draw_position()
+        if self.playlist.size > 1 and self.playlist.is_playing(self.playlist.song_at(position)):
+            position = self._draw_position()    # Already playing: counts as played
+
+        current_before = self.current_title()
+        song = self.play_at(position)
+        self.notify("🔀 Next Song", f"Moved from {current_before} → {song.title}")
+        return song
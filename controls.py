@@ -2,7 +2,7 @@
 GUI Controls - All buttons, inputs, and user interactions
 """
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, filedialog
 from utils.helpers import get_random_song
 
 class Controls:
@@ -76,22 +76,63 @@ class Controls:
         ttk.Button(playback_frame, text="▶ Play", command=self.play_current, width=10).pack(side=tk.LEFT, padx=2)
         ttk.Button(playback_frame, text="⏭ Next", command=self.next_song, width=10).pack(side=tk.LEFT, padx=2)
         
+        # Shuffle: relink once, or pick a random next song each time
+        shuffle_frame = ttk.Frame(self.control_frame)
+        shuffle_frame.grid(row=10, column=0, columnspan=3, pady=5)
+        
+        self.spread_var = tk.BooleanVar(value=False)
+        self.shuffle_play_var = tk.BooleanVar(value=False)
+        ttk.Button(shuffle_frame, text="🔀 Shuffle", command=self.shuffle, width=10).pack(side=tk.LEFT, padx=2)
+        ttk.Checkbutton(shuffle_frame, text="Spread artists", variable=self.spread_var).pack(side=tk.LEFT, padx=2)
+        ttk.Checkbutton(shuffle_frame, text="Shuffle play", variable=self.shuffle_play_var,
+                        command=self.toggle_shuffle_play).pack(side=tk.LEFT, padx=2)
+        
+        # ---------- Find Song (type-ahead) ----------
+        ttk.Separator(self.control_frame, orient='horizontal').grid(row=11, column=0, columnspan=3, sticky="ew", pady=10)
+        ttk.Label(self.control_frame, text="Find Song:", font=("Arial", 10, "bold")).grid(row=12, column=0, columnspan=3, pady=5)
+        
+        self.search_entry = ttk.Entry(self.control_frame, width=30)
+        self.search_entry.grid(row=13, column=0, columnspan=3, pady=2, padx=5)
+        self.search_entry.bind('<KeyRelease>', self.search)
+        self.search_entry.bind('<Return>', self.jump_to_match)
+        
+        # Matches, best first - pick one to make it the current song
+        # exportselection=False: selecting text elsewhere must not clear the pick (and jump)
+        self.search_results = tk.Listbox(self.control_frame, height=5, width=40, activestyle='none',
+                                         exportselection=False)
+        self.search_results.grid(row=14, column=0, columnspan=3, pady=2, padx=5)
+        self.search_results.bind('<<ListboxSelect>>', self.jump_to_match)
+        self.search_ids = []    # Song id of each line
+        
         # ---------- Playlist Operations ----------
-        ttk.Separator(self.control_frame, orient='horizontal').grid(row=10, column=0, columnspan=3, sticky="ew", pady=10)
-        ttk.Label(self.control_frame, text="Playlist Operations:", font=("Arial", 10, "bold")).grid(row=11, column=0, columnspan=3, pady=5)
+        ttk.Separator(self.control_frame, orient='horizontal').grid(row=15, column=0, columnspan=3, sticky="ew", pady=10)
+        ttk.Label(self.control_frame, text="Playlist Operations:", font=("Arial", 10, "bold")).grid(row=16, column=0, columnspan=3, pady=5)
         
         ops_frame = ttk.Frame(self.control_frame)
-        ops_frame.grid(row=12, column=0, columnspan=3, pady=5)
+        ops_frame.grid(row=17, column=0, columnspan=3, pady=5)
         
         # Operation buttons
         ttk.Button(ops_frame, text="Remove Current", command=self.remove_current, width=15).pack(side=tk.LEFT, padx=2)
         ttk.Button(ops_frame, text="Clear All", command=self.clear_playlist, width=15).pack(side=tk.LEFT, padx=2)
+        ttk.Button(ops_frame, text="Import File...", command=self.import_file, width=15).pack(side=tk.LEFT, padx=2)
+        
+        file_frame = ttk.Frame(self.control_frame)
+        file_frame.grid(row=18, column=0, columnspan=3, pady=5)
+        
+        ttk.Button(file_frame, text="💾 Save...", command=self.save_playlist, width=15).pack(side=tk.LEFT, padx=2)
+        ttk.Button(file_frame, text="📂 Open...", command=self.open_playlist, width=15).pack(side=tk.LEFT, padx=2)
+        
+        history_frame = ttk.Frame(self.control_frame)
+        history_frame.grid(row=19, column=0, columnspan=3, pady=5)
+        
+        ttk.Button(history_frame, text="↶ Undo", command=self.undo, width=15).pack(side=tk.LEFT, padx=2)
+        ttk.Button(history_frame, text="↷ Redo", command=self.redo, width=15).pack(side=tk.LEFT, padx=2)
         
         # ---------- Stats ----------
-        ttk.Separator(self.control_frame, orient='horizontal').grid(row=13, column=0, columnspan=3, sticky="ew", pady=10)
+        ttk.Separator(self.control_frame, orient='horizontal').grid(row=20, column=0, columnspan=3, sticky="ew", pady=10)
         
         self.ops_label = ttk.Label(self.control_frame, text="Operations: 0", font=("Arial", 9))
-        self.ops_label.grid(row=14, column=0, columnspan=3, pady=5)
+        self.ops_label.grid(row=21, column=0, columnspan=3, pady=5)
     
     # ---------- EVENT HANDLERS ----------
     
@@ -112,11 +153,15 @@ class Controls:
         duration = self.duration_entry.get().strip()
         
         if not title or not artist or not duration:
-            messagebox.showwarning("Input Error", "Please fill all fields!")
+            self.app.notify("Input Error", "Please fill all fields!", "warning")
             return
         
+        try:
+            self.app.add_song(title, artist, duration)
+        except ValueError as e:
+            self.app.notify("Input Error", str(e), "warning")
+            return
         self.increment_ops()
-        self.app.add_song(title, artist, duration)
         
         # Clear inputs
         self.title_entry.delete(0, tk.END)
@@ -147,6 +192,15 @@ class Controls:
         self.increment_ops()
         self.app.play_current()
     
+    def shuffle(self):
+        """Shuffle the playlist order"""
+        self.increment_ops()
+        self.app.shuffle(self.spread_var.get())
+    
+    def toggle_shuffle_play(self):
+        """Turn random Next on / off"""
+        self.app.set_shuffle_play(self.shuffle_play_var.get())
+    
     def remove_current(self):
         """Remove current song"""
         self.increment_ops()
@@ -156,3 +210,64 @@ class Controls:
         """Clear all songs"""
         self.increment_ops()
         self.app.clear_playlist()
+    
+    def search(self, event=None):
+        """Show the songs starting with the typed text (on every key)"""
+        songs = self.app.search(self.search_entry.get())
+        self.search_ids = [song.song_id for song in songs]
+        self.search_results.delete(0, tk.END)
+        for song in songs:
+            self.search_results.insert(tk.END, f"{song.title} - {song.artist}")
+    
+    def jump_to_match(self, event=None):
+        """Make the picked match (Enter: the first one) the current song"""
+        if not self.search_ids:
+            return
+        picked = self.search_results.curselection()
+        if picked:
+            position = picked[0]
+        elif event is not None and event.widget is self.search_entry:
+            position = 0        # Enter in the search box
+        else:
+            return              # Selection cleared - nothing was picked
+        self.increment_ops()
+        self.app.play_song(self.search_ids[position])
+    
+    def undo(self, event=None):
+        """Take back the last change (Ctrl+Z)"""
+        self.increment_ops()
+        self.app.undo()
+    
+    def redo(self, event=None):
+        """Do the last undone change again (Ctrl+Y)"""
+        self.increment_ops()
+        self.app.redo()
+    
+    def import_file(self):
+        """Pick a CSV / JSONL / M3U file and load it"""
+        path = filedialog.askopenfilename(
+            title="Import Songs",
+            filetypes=[("Song files", "*.csv *.jsonl *.ndjson *.m3u *.m3u8"), ("All files", "*.*")]
+        )
+        if path:
+            self.increment_ops()
+            self.app.import_file(path)
+    
+    def save_playlist(self):
+        """Save the playlist to a snapshot file"""
+        path = filedialog.asksaveasfilename(
+            title="Save Playlist", defaultextension=".pls",
+            filetypes=[("Playlist snapshot", "*.pls"), ("All files", "*.*")]
+        )
+        if path:
+            self.app.save_playlist(path)
+    
+    def open_playlist(self):
+        """Open a saved playlist snapshot"""
+        path = filedialog.askopenfilename(
+            title="Open Playlist",
+            filetypes=[("Playlist snapshot", "*.pls"), ("All files", "*.*")]
+        )
+        if path:
+            self.increment_ops()
+            self.app.open_playlist(path)
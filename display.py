@@ -4,14 +4,26 @@ Shows nodes, pointers, and connections visually
 """
 import tkinter as tk
 from tkinter import ttk
+from utils.helpers import format_time
 
 class Display:
+    # Node layout (canvas pixels)
+    NODE_WIDTH = 120
+    NODE_HEIGHT = 60
+    SPACING = 150
+    START_X = 50
+    NODE_Y = 100
+    
     def __init__(self, parent, app):
         self.parent = parent
         self.app = app
         self.canvas = None
         self.stats_label = None
         self.now_playing_label = None
+        self.playlist = None      # Last playlist drawn (for scroll redraws)
+        self.node_items = {}      # song id -> canvas items of that node
+        self.empty_text = None    # "Playlist is empty!" item
+        self.loop_text = None     # Circular "↻ head" item
         
         self.create_display()
     
@@ -25,10 +37,11 @@ class Display:
         self.canvas = tk.Canvas(viz_frame, bg='white', height=300)
         self.canvas.pack(fill=tk.BOTH, expand=True, pady=5)
         
-        # Add scrollbar for many songs
-        scrollbar = ttk.Scrollbar(viz_frame, orient="horizontal", command=self.canvas.xview)
+        # Add scrollbar for many songs (redraws the newly visible nodes)
+        scrollbar = ttk.Scrollbar(viz_frame, orient="horizontal", command=self.on_scroll)
         scrollbar.pack(fill=tk.X, pady=(0, 5))
         self.canvas.configure(xscrollcommand=scrollbar.set)
+        self.canvas.bind("<Configure>", lambda event: self.redraw())
         
         # ---------- Now Playing Display ----------
         now_frame = ttk.LabelFrame(self.parent, text="Now Playing", padding="10")
@@ -53,159 +66,281 @@ class Display:
         )
         self.stats_label.pack()
     
-    def draw_linked_list(self, playlist):
-        """Draw the linked list visualization"""
-        # Clear canvas
+    # ---------- VIEWPORT (only draw what can be seen) ----------
+    
+    def on_scroll(self, *args):
+        """Scrollbar moved: scroll canvas, then draw the nodes now in view"""
+        self.canvas.xview(*args)
+        self.redraw()
+    
+    def redraw(self):
+        """Draw the last playlist again (after scroll / resize)"""
+        if self.playlist is not None:
+            with self.app.controller.reading():
+                self.draw_linked_list(self.playlist)
+    
+    def visible_range(self, size, margin=2):
+        """(first node number, how many) that fit in the visible x-range"""
+        width = self.canvas.winfo_width()
+        if width <= 1:
+            width = 1000  # Not shown yet: assume the window width
+        left = self.canvas.canvasx(0)
+        first = max(0, int((left - self.START_X) // self.SPACING) - margin)
+        last = int((left + width - self.START_X) // self.SPACING) + margin
+        return first, min(last + 1, size) - first
+    
+    def reset_canvas(self):
+        """Wipe the canvas and forget every node's items"""
         self.canvas.delete("all")
+        self.node_items = {}
+        self.empty_text = None
+        self.loop_text = None
+        self.draw_legend()
+    
+    def draw_linked_list(self, playlist):
+        """Draw the linked list visualization (visible nodes only).
         
-        if not playlist or playlist.size == 0:
-            self.canvas.create_text(
-                300, 150, 
-                text="Playlist is empty!\nAdd songs to visualize.",
-                font=("Arial", 14),
-                fill="gray"
-            )
-            return
+        Canvas items are kept per song between calls, so only songs that
+        changed are created, moved, recoloured or deleted.
+        """
+        # New playlist object (type changed): start from a clean canvas
+        if playlist is not self.playlist:
+            self.reset_canvas()
+        self.playlist = playlist
         
-        # Get all songs
-        songs = playlist.get_all_songs()
-        if not songs:
+        if not playlist or playlist.size == 0:
+            for song_id in list(self.node_items):
+                self.delete_node(song_id)
+            self.show_loop_marker(None)
+            if self.empty_text is None:
+                self.empty_text = self.canvas.create_text(
+                    300, 150, 
+                    text="Playlist is empty!\nAdd songs to visualize.",
+                    font=("Arial", 14),
+                    fill="gray"
+                )
             return
+        if self.empty_text is not None:
+            self.canvas.delete(self.empty_text)
+            self.empty_text = None
         
-        # Calculate positions
-        node_width = 120
-        node_height = 60
-        spacing = 150
-        start_x = 50
-        y = 100
+        # Only the nodes inside the viewport (+ a small margin)
+        first, count = self.visible_range(playlist.size)
+        two_way = playlist.list_type != "Singly Linked List"
         
-        # Draw nodes
-        for i, song in enumerate(songs):
-            x = start_x + i * spacing
-            
-            # Draw node rectangle
-            if song.is_current:
-                # Current song - highlighted
-                self.canvas.create_rectangle(
-                    x, y, x + node_width, y + node_height,
-                    fill="lightgreen", outline="darkgreen", width=3
-                )
-                fill_color = "darkgreen"
+        # Create / update the visible nodes (streamed - no copy)
+        visible = set()
+        for i, song in enumerate(playlist.iter_range(first, count), start=first):
+            visible.add(song.song_id)
+            has_prev = two_way and song.prev is not None
+            items = self.node_items.get(song.song_id)
+            if items is None:
+                self.node_items[song.song_id] = self.create_node(song, i, has_prev)
             else:
-                # Normal song
-                self.canvas.create_rectangle(
-                    x, y, x + node_width, y + node_height,
-                    fill="lightblue", outline="blue", width=2
-                )
-                fill_color = "black"
-            
-            # Draw song info
-            title = song.title[:15] + "..." if len(song.title) > 15 else song.title
+                self.update_node(items, song, i, has_prev)
+        
+        # Delete nodes that were removed or scrolled out of view
+        for song_id in list(self.node_items):
+            if song_id not in visible:
+                self.delete_node(song_id)
+        
+        # Circular: show where tail's next pointer goes
+        at_end = playlist.list_type == "Circular Linked List" and first + count == playlist.size
+        self.show_loop_marker(playlist.size if at_end else None)
+        
+        # Update canvas scroll region
+        total_width = self.START_X + playlist.size * self.SPACING + 50
+        self.canvas.configure(scrollregion=(0, 0, total_width, 400))
+    
+    # ---------- ONE NODE = A GROUP OF CANVAS ITEMS ----------
+    
+    def node_colors(self, is_current):
+        """(fill, outline, width, text color) for a node rectangle"""
+        if is_current:
+            return "lightgreen", "darkgreen", 3, "darkgreen"   # Current song
+        return "lightblue", "blue", 2, "black"                  # Normal song
+    
+    def create_node(self, song, i, has_prev):
+        """Draw one song node; returns its item ids and drawn state"""
+        x = self.START_X + i * self.SPACING
+        y = self.NODE_Y
+        node_width = self.NODE_WIDTH
+        tag = f"song{song.song_id}"
+        fill, outline, width, text_color = self.node_colors(song.is_current)
+        
+        # Draw node rectangle
+        rect = self.canvas.create_rectangle(
+            x, y, x + node_width, y + self.NODE_HEIGHT,
+            fill=fill, outline=outline, width=width, tags=tag
+        )
+        
+        # Draw song info
+        title = song.title[:15] + "..." if len(song.title) > 15 else song.title
+        texts = [
             self.canvas.create_text(
                 x + node_width/2, y + 15,
                 text=title, font=("Arial", 9, "bold"),
-                fill=fill_color
-            )
-            
+                fill=text_color, tags=tag
+            ),
             self.canvas.create_text(
                 x + node_width/2, y + 30,
                 text=song.artist, font=("Arial", 8),
-                fill=fill_color
-            )
-            
+                fill=text_color, tags=tag
+            ),
             self.canvas.create_text(
                 x + node_width/2, y + 45,
                 text=song.duration, font=("Arial", 8),
-                fill=fill_color
+                fill=text_color, tags=tag
+            ),
+        ]
+        
+        # Draw node number
+        label = self.canvas.create_text(
+            x + 10, y + 10,
+            text=f"#{i + 1}", font=("Arial", 8, "bold"),
+            fill="red", tags=tag
+        )
+        
+        items = {
+            "tag": tag, "rect": rect, "texts": texts, "label": label,
+            "position": i, "current": song.is_current,
+            "next": False, "prev": False
+        }
+        self.set_pointers(items, i, song.next is not None, has_prev)
+        return items
+    
+    def update_node(self, items, song, i, has_prev):
+        """Change only what differs from the last drawing of this node"""
+        # Moved (songs inserted/removed before it): shift the whole group
+        if items["position"] != i:
+            self.canvas.move(items["tag"], (i - items["position"]) * self.SPACING, 0)
+            self.canvas.itemconfigure(items["label"], text=f"#{i + 1}")
+            items["position"] = i
+        
+        # Became / stopped being the current song: recolour
+        if items["current"] != song.is_current:
+            fill, outline, width, text_color = self.node_colors(song.is_current)
+            self.canvas.itemconfigure(items["rect"], fill=fill, outline=outline, width=width)
+            for text in items["texts"]:
+                self.canvas.itemconfigure(text, fill=text_color)
+            items["current"] = song.is_current
+        
+        # Pointer arrows appeared / disappeared
+        self.set_pointers(items, i, song.next is not None, has_prev)
+    
+    def delete_node(self, song_id):
+        """Remove every canvas item of one node"""
+        self.canvas.delete(self.node_items.pop(song_id)["tag"])
+    
+    def set_pointers(self, items, i, has_next, has_prev):
+        """Add or delete the next / prev arrows of one node"""
+        x = self.START_X + i * self.SPACING
+        y = self.NODE_Y
+        node_width = self.NODE_WIDTH
+        node_height = self.NODE_HEIGHT
+        spacing = self.SPACING
+        tag = items["tag"]
+        
+        # Draw next pointer (→)
+        if has_next and not items["next"]:
+            arrow_start = x + node_width
+            arrow_end = x + spacing
+            tags = (tag, tag + "next")
+            
+            # Draw arrow line
+            self.canvas.create_line(
+                arrow_start, y + node_height/2,
+                arrow_end - 20, y + node_height/2,
+                arrow="last", width=2, fill="blue", tags=tags
+            )
+            
+            # Draw arrow head
+            self.canvas.create_line(
+                arrow_end - 25, y + node_height/2 - 5,
+                arrow_end - 20, y + node_height/2,
+                arrow_end - 25, y + node_height/2 + 5,
+                fill="blue", width=2, tags=tags
             )
             
-            # Draw node number
+            # Label for "next"
             self.canvas.create_text(
-                x + 10, y + 10,
-                text=f"#{i+1}", font=("Arial", 8, "bold"),
-                fill="red"
+                x + node_width/2 + spacing/2, y + node_height/2 - 15,
+                text="next", font=("Arial", 7),
+                fill="blue", tags=tags
             )
+        elif items["next"] and not has_next:
+            self.canvas.delete(tag + "next")
+        items["next"] = has_next
+        
+        # Draw prev pointer (←) for doubly/circular
+        if has_prev and not items["prev"]:
+            arrow_start = x
+            arrow_end = x - spacing + 20
+            tags = (tag, tag + "prev")
             
-            # Draw next pointer (→)
-            if song.next:
-                arrow_start = x + node_width
-                arrow_end = x + spacing
-                
-                # Draw arrow line
-                self.canvas.create_line(
-                    arrow_start, y + node_height/2,
-                    arrow_end - 20, y + node_height/2,
-                    arrow="last", width=2, fill="blue"
-                )
-                
-                # Draw arrow head
-                self.canvas.create_line(
-                    arrow_end - 25, y + node_height/2 - 5,
-                    arrow_end - 20, y + node_height/2,
-                    arrow_end - 25, y + node_height/2 + 5,
-                    fill="blue", width=2
-                )
-                
-                # Label for "next"
-                self.canvas.create_text(
-                    x + node_width/2 + spacing/2, y + node_height/2 - 15,
-                    text="next", font=("Arial", 7),
-                    fill="blue"
-                )
+            # Draw arrow line
+            self.canvas.create_line(
+                arrow_start, y + node_height/2,
+                arrow_end, y + node_height/2,
+                arrow="last", width=2, fill="green", dash=(4, 2), tags=tags
+            )
             
-            # Draw prev pointer (←) for doubly/circular
-            if hasattr(song, 'prev') and song.prev and playlist.list_type != "Singly Linked List":
-                arrow_start = x
-                arrow_end = x - spacing + 20
-                
-                # Draw arrow line
-                self.canvas.create_line(
-                    arrow_start, y + node_height/2,
-                    arrow_end, y + node_height/2,
-                    arrow="last", width=2, fill="green", dash=(4, 2)
-                )
-                
-                # Draw arrow head
-                self.canvas.create_line(
-                    arrow_end + 5, y + node_height/2 - 5,
-                    arrow_end, y + node_height/2,
-                    arrow_end + 5, y + node_height/2 + 5,
-                    fill="green", width=2
-                )
-                
-                # Label for "prev"
-                self.canvas.create_text(
-                    x - spacing/2, y + node_height/2 - 15,
-                    text="prev", font=("Arial", 7),
-                    fill="green"
-                )
-        
-        # Update canvas scroll region
-        total_width = start_x + len(songs) * spacing + 50
-        self.canvas.configure(scrollregion=(0, 0, total_width, 400))
+            # Draw arrow head
+            self.canvas.create_line(
+                arrow_end + 5, y + node_height/2 - 5,
+                arrow_end, y + node_height/2,
+                arrow_end + 5, y + node_height/2 + 5,
+                fill="green", width=2, tags=tags
+            )
+            
+            # Label for "prev"
+            self.canvas.create_text(
+                x - spacing/2, y + node_height/2 - 15,
+                text="prev", font=("Arial", 7),
+                fill="green", tags=tags
+            )
+        elif items["prev"] and not has_prev:
+            self.canvas.delete(tag + "prev")
+        items["prev"] = has_prev
+    
+    def show_loop_marker(self, position):
+        """Circular "↻ head" marker after the tail (None = hide it)"""
+        if position is None:
+            if self.loop_text is not None:
+                self.canvas.delete(self.loop_text)
+                self.loop_text = None
+            return
         
-        # Add legend
-        self.draw_legend()
+        x = self.START_X + position * self.SPACING
+        y = self.NODE_Y + self.NODE_HEIGHT/2
+        if self.loop_text is None:
+            self.loop_text = self.canvas.create_text(
+                x, y,
+                text="↻ head", font=("Arial", 9, "bold"),
+                fill="purple"
+            )
+        else:
+            self.canvas.coords(self.loop_text, x, y)
     
     def draw_legend(self):
-        """Draw legend for visualization"""
+        """Draw legend for visualization (once per canvas reset)"""
         # Legend box
-        self.canvas.create_rectangle(20, 20, 220, 90, fill="white", outline="gray")
+        self.canvas.create_rectangle(20, 20, 220, 90, fill="white", outline="gray", tags="legend")
         
         # Title
-        self.canvas.create_text(120, 30, text="Legend", font=("Arial", 9, "bold"))
+        self.canvas.create_text(120, 30, text="Legend", font=("Arial", 9, "bold"), tags="legend")
         
         # Current node
-        self.canvas.create_rectangle(30, 40, 50, 60, fill="lightgreen", outline="darkgreen")
-        self.canvas.create_text(70, 50, text="= Current Song", font=("Arial", 8), anchor="w")
+        self.canvas.create_rectangle(30, 40, 50, 60, fill="lightgreen", outline="darkgreen", tags="legend")
+        self.canvas.create_text(70, 50, text="= Current Song", font=("Arial", 8), anchor="w", tags="legend")
         
         # Normal node
-        self.canvas.create_rectangle(30, 60, 50, 80, fill="lightblue", outline="blue")
-        self.canvas.create_text(70, 70, text="= Other Songs", font=("Arial", 8), anchor="w")
+        self.canvas.create_rectangle(30, 60, 50, 80, fill="lightblue", outline="blue", tags="legend")
+        self.canvas.create_text(70, 70, text="= Other Songs", font=("Arial", 8), anchor="w", tags="legend")
         
         # Pointer labels
-        self.canvas.create_text(130, 50, text="→ = next pointer", font=("Arial", 8), fill="blue", anchor="w")
-        self.canvas.create_text(130, 70, text="← = prev pointer", font=("Arial", 8), fill="green", anchor="w")
+        self.canvas.create_text(130, 50, text="→ = next pointer", font=("Arial", 8), fill="blue", anchor="w", tags="legend")
+        self.canvas.create_text(130, 70, text="← = prev pointer", font=("Arial", 8), fill="green", anchor="w", tags="legend")
     
     def update_now_playing(self, song):
         """Update now playing display"""
@@ -229,6 +364,11 @@ class Display:
         Current Song: {stats['current']}
         First Song: {stats['head']}
         Last Song: {stats['tail']}
+        Bytes per Node: {stats['node_bytes']}
+        
+        Total Playtime: {format_time(stats['total_seconds'])}
+        Artists: {stats['artists']} (current artist: {stats['current_artist_songs']} songs)
+        Shortest / Longest: {self.length_text(stats['shortest'])} / {self.length_text(stats['longest'])}
         
         Navigation:
         • Singly LL: Only forward (next)
@@ -237,3 +377,8 @@ class Display:
         """
         
         self.stats_label.config(text=stats_text)
+    
+    @staticmethod
+    def length_text(seconds):
+        """Song length for the stats panel ("-" for an empty playlist)"""
+        return "-" if seconds is None else format_time(seconds)
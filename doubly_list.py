@@ -4,8 +4,12 @@ Each node points to BOTH next AND previous
 Can move forward AND backward
 """
 from .singly_list import SinglyLinkedList
+from .node import SongNode
 
 class DoublyLinkedList(SinglyLinkedList):
+    # Node type used by this list (has prev pointer)
+    node_class = SongNode
+
     def __init__(self):
         # Call parent constructor
         super().__init__()
@@ -15,10 +19,8 @@ class DoublyLinkedList(SinglyLinkedList):
     
     def add_song(self, title, artist, duration):
         """Add song with BOTH forward and backward pointers"""
-        from .node import SongNode
-        
         # 1. Create new node
-        new_song = SongNode(title, artist, duration)
+        new_song = self.node_class(title, artist, duration)
         
         # 2. If playlist is empty
         if self.head is None:
@@ -37,44 +39,113 @@ class DoublyLinkedList(SinglyLinkedList):
         
         # 6. Increase size
         self.size += 1
+        self._song_added(new_song)
         
         return new_song
     
+    def _attach_chain(self, first, last, count):
+        """Link a ready-made chain after tail (first points back to tail)"""
+        first.prev = self.tail
+        super()._attach_chain(first, last, count)
+    
     def remove_current(self):
         """Remove current song with prev pointer updates"""
         # 1. Check if empty
         if self.current is None:
             return None
+        removed = self.current
+        following = removed.next
+        previous = removed.prev
         
-        # 2. Update previous song's next pointer
-        if self.current.prev:
-            self.current.prev.next = self.current.next
+        # 2. Unlink it (neighbours point to each other)
+        self._unlink(removed)
+        
+        # 3. Move current pointer
+        if following:
+            self.current = following
+        elif previous:
+            self.current = previous
         else:
-            # Current is head
-            self.head = self.current.next
+            self.current = None
         
-        # 3. Update next song's prev pointer
-        if self.current.next:
-            self.current.next.prev = self.current.prev
+        return self.current
+    
+    def _unlink(self, song, before=None):
+        """Take `song` out - prev pointer means no search for `before`"""
+        # 1. Update previous song's next pointer
+        if song.prev:
+            song.prev.next = song.next
         else:
-            # Current is tail
-            self.tail = self.current.prev
+            # Song is head
+            self.head = song.next
         
-        # 4. Move current pointer
-        if self.current.next:
-            self.current = self.current.next
-        elif self.current.prev:
-            self.current = self.current.prev
+        # 2. Update next song's prev pointer
+        if song.next:
+            song.next.prev = song.prev
         else:
-            self.current = None
+            # Song is tail
+            self.tail = song.prev
+        song.next = None
+        song.prev = None
         
-        # 5. Decrease size
+        # 3. Decrease size
         self.size -= 1
-        
-        return self.current
+        self._song_removed(song)
+    
+    def _link_after(self, before, song):
+        """Hook `song` in after `before` (None = new head), list not empty"""
+        after = self.head if before is None else before.next
+        song.prev = before
+        song.next = after
+        if after is None:
+            self.tail = song
+        else:
+            after.prev = song
+        if before is None:
+            self.head = song
+        else:
+            before.next = song
     
     # ------------------- NEW METHOD -------------------
     
+    def _relink(self, had_prev):
+        """Point every node back to the one before it (one walk, no copies)"""
+        if had_prev:
+            return
+        previous = None
+        song = self.head
+        while song is not None:
+            if not isinstance(song, SongNode):
+                song = self._upgrade_node(song, previous)
+            song.prev = previous
+            previous = song
+            song = song.next
+    
+    def _upgrade_node(self, old, previous):
+        """Swap a node without a prev slot (from a singly list) for a SongNode
+        with the same id - Python cannot add a slot to an existing object"""
+        new = SongNode.from_node(old)
+        old.next = None
+        
+        if previous is None:
+            self.head = new
+        else:
+            previous.next = new
+        if self.tail is old:
+            self.tail = new
+        if self._current is old:
+            self.current = new
+        
+        # Same id: index and position tree just point at the new node
+        self.index.add(new.song_id, new.title, new.artist, new)
+        if self.positions is not None:
+            self.positions.replace(new.song_id, new)
+        return new
+    
+    def _before(self, song):
+        """Song just before `song` - the prev pointer, O(1)"""
+        return song.prev
+    
     def prev_song(self):
         """Move to previous song (NEW: Works in doubly linked)"""
         if self.current and self.current.prev:
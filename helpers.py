@@ -22,26 +22,37 @@ def get_random_song():
     return random.choice(SAMPLE_SONGS)
 
 def format_time(seconds):
-    """Convert seconds to mm:ss format"""
-    minutes = seconds // 60
+    """Convert seconds to mm:ss format (h:mm:ss from one hour on)"""
+    hours = seconds // 3600
+    minutes = seconds // 60 % 60 if hours else seconds // 60
     seconds = seconds % 60
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
     return f"{minutes}:{seconds:02d}"
 
-def create_sample_playlist(list_type):
-    """Create a playlist with 4 sample songs"""
-    from data_structures import SinglyLinkedList, DoublyLinkedList, CircularLinkedList
+def new_playlist(list_type, backend="linked"):
+    """Create an empty playlist ("linked" nodes or "array" columns backend)"""
+    from data_structures import (SinglyLinkedList, DoublyLinkedList,
+                                 CircularLinkedList, ArrayPlaylist)
+    
+    # Array backend handles all three behaviours itself
+    if backend == "array":
+        return ArrayPlaylist(list_type)
     
     # Choose correct list type
     if list_type == "Singly Linked List":
-        playlist = SinglyLinkedList()
+        return SinglyLinkedList()
     elif list_type == "Doubly Linked List":
-        playlist = DoublyLinkedList()
+        return DoublyLinkedList()
     else:  # Circular
-        playlist = CircularLinkedList()
+        return CircularLinkedList()
+
+def create_sample_playlist(list_type, backend="linked"):
+    """Create a playlist with 4 sample songs"""
+    playlist = new_playlist(list_type, backend)
     
-    # Add 4 sample songs
-    for i in range(4):
-        song = SAMPLE_SONGS[i]
-        playlist.add_song(song["title"], song["artist"], song["duration"])
+    # Add 4 sample songs (one bulk add)
+    playlist.add_songs((song["title"], song["artist"], song["duration"])
+                       for song in SAMPLE_SONGS[:4])
     
     return playlist
@@ -0,0 +1,136 @@
+"""
+UNDO / REDO HISTORY
+Every change is one small step that only remembers what it changed:
+- AddSong:     the new song's id and the song before it
+- RemoveSong:  the removed node (or row data) and the song before it
+- ClearAll:    the whole detached list (head, tail, index, ...) - nothing copied
+- ChangeType:  the old and new list type
+Undo and redo are O(1) (plus O(log n) when the position tree is built).
+
+Memory is bounded: at most `limit` steps, and at most `max_songs` songs kept
+alive by removed songs / cleared lists. The oldest steps are dropped first.
+"""
+from collections import deque
+
+UNDO_LIMIT = 100            # Steps
+UNDO_MAX_SONGS = 1_000_000  # Songs held by the steps together
+
+
+class AddSong:
+    label = "Add Song"
+    songs = 1
+
+    def __init__(self, song_id, before_id):
+        self.song_id = song_id
+        self.before_id = before_id      # Old tail (None: list was empty)
+        self.hole = None                # Filled while the step is undone
+
+    def undo(self, playlist):
+        self.hole = playlist.cut(self.song_id, self.before_id)
+
+    def redo(self, playlist):
+        playlist.put_back(self.hole)
+        self.hole = None
+
+
+class RemoveSong:
+    label = "Remove Song"
+    songs = 1
+
+    def __init__(self, song_id, hole):
+        self.song_id = song_id
+        self.hole = hole                # Removed song + the song before it
+
+    def undo(self, playlist):
+        playlist.put_back(self.hole, make_current=True)  # It was playing
+
+    def redo(self, playlist):
+        playlist.jump_to(self.song_id)
+        self.hole = playlist.cut(self.song_id)
+
+
+class ClearAll:
+    label = "Clear All"
+
+    def __init__(self, state, songs):
+        self.state = state              # Everything the playlist held
+        self.songs = songs
+
+    def undo(self, playlist):
+        playlist.restore_all(self.state)
+        self.state = None
+
+    def redo(self, playlist):
+        self.state = playlist.detach_all()
+
+
+class ChangeType:
+    songs = 0
+
+    def __init__(self, old_type, new_type):
+        self.old_type = old_type
+        self.new_type = new_type
+        self.label = f"Switch to {new_type}"
+
+    def undo(self, playlist):
+        playlist.convert_to(self.old_type)
+
+    def redo(self, playlist):
+        playlist.convert_to(self.new_type)
+
+
+class History:
+    """Undo and redo stacks with a size cap
+
+    Steps assume the playlist looks exactly as they left it, so every other
+    change to the playlist (shuffle, import, open, ...) must call clear().
+    """
+
+    def __init__(self, limit=UNDO_LIMIT, max_songs=UNDO_MAX_SONGS):
+        self.limit = limit
+        self.max_songs = max_songs
+        self.undo_steps = deque()
+        self.redo_steps = []
+        self.songs = 0          # Songs held by all steps (undo + redo)
+
+    def push(self, step):
+        """A new change was made - returns False if it is too big to keep"""
+        self.songs -= sum(old.songs for old in self.redo_steps)
+        self.redo_steps.clear()
+        self.undo_steps.append(step)
+        self.songs += step.songs
+
+        # Oldest steps go first (a step bigger than the cap is not kept)
+        while self.undo_steps and (len(self.undo_steps) > self.limit or self.songs > self.max_songs):
+            self.songs -= self.undo_steps.popleft().songs
+        return bool(self.undo_steps) and self.undo_steps[-1] is step
+
+    def can_undo(self):
+        return bool(self.undo_steps)
+
+    def can_redo(self):
+        return bool(self.redo_steps)
+
+    def undo(self, playlist):
+        """Take back the last step - returns it (None if there is nothing)"""
+        if not self.undo_steps:
+            return None
+        step = self.undo_steps.pop()
+        step.undo(playlist)
+        self.redo_steps.append(step)
+        return step
+
+    def redo(self, playlist):
+        """Do the last undone step again - returns it (None if there is nothing)"""
+        if not self.redo_steps:
+            return None
+        step = self.redo_steps.pop()
+        step.redo(playlist)
+        self.undo_steps.append(step)
+        return step
+
+    def clear(self):
+        """Forget everything (frees removed songs and cleared lists)"""
+        self.undo_steps.clear()
+        self.redo_steps.clear()
+        self.songs = 0
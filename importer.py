@@ -0,0 +1,172 @@
+"""
+SONG IMPORTER (STREAMING)
+Loads big song libraries from files without reading them into memory:
+- CSV:    header row with title, artist, duration columns
+- JSONL:  one {"title": ..., "artist": ..., "duration": ...} per line
+- M3U:    #EXTINF:seconds,Artist - Title  (plain M3U lines work too)
+
+Rows are read one at a time and handed to playlist.add_songs() in chunks,
+so only one chunk of songs is ever alive at once.
+"""
+import csv
+import json
+import os
+from itertools import islice
+from data_structures.node import MAX_SECONDS, parse_duration
+
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".m3u": "m3u", ".m3u8": "m3u"}
+CHUNK_SIZE = 10_000
+
+
+def m3u_seconds(text):
+    """#EXTINF length ("-1" = unknown length -> 0)"""
+    seconds = max(0, int(float(text)))
+    if seconds > MAX_SECONDS:
+        raise ValueError(f"Invalid duration: {text!r} (too long)")
+    return seconds
+
+
+def detect_format(path):
+    """File format from the extension ("csv", "jsonl" or "m3u")"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unknown song file type: {extension or path!r} "
+                         f"(expected {', '.join(sorted(FORMATS))})")
+    return FORMATS[extension]
+
+
+class SongReader:
+    """Iterates (title, artist, seconds) from a song file, one row at a time
+
+    Bad rows are skipped and counted (or raise ValueError with strict=True).
+    """
+
+    def __init__(self, path, fmt=None, strict=False, encoding="utf-8"):
+        self.path = path
+        self.fmt = fmt or detect_format(path)
+        self.strict = strict
+        self.encoding = encoding
+        self.total_bytes = os.path.getsize(path)
+        self.skipped = 0        # Rows that could not be read
+        self.file = None
+        # Durations are parsed per row, where a bad one only skips that row
+        self.parse_duration = m3u_seconds if self.fmt == "m3u" else parse_duration
+
+    def __iter__(self):
+        rows = {"csv": self._csv_rows, "jsonl": self._jsonl_rows, "m3u": self._m3u_rows}[self.fmt]
+        with open(self.path, encoding=self.encoding, newline="") as self.file:
+            for line_number, row in rows(self.file):
+                try:
+                    yield self._song(*row)
+                except (TypeError, ValueError, OverflowError) as e:   # Overflow: "inf"
+                    if self.strict:
+                        raise ValueError(f"{self.path}:{line_number}: {e}") from None
+                    self.skipped += 1
+
+    def progress(self):
+        """How much of the file has been read (0.0 - 1.0)"""
+        if self.file is None:
+            return 0.0
+        if self.file.closed or not self.total_bytes:
+            return 1.0
+        # The text layer hides its position while iterating; the byte buffer
+        # underneath is at most one read-ahead block further
+        return min(1.0, self.file.buffer.tell() / self.total_bytes)
+
+    def _song(self, title, artist, duration):
+        """Validate one row"""
+        title = str(title or "").strip()
+        artist = str(artist or "").strip()
+        if not title or not artist:
+            raise ValueError("title and artist are required")
+        return title, artist, self.parse_duration(duration)
+
+    # ------------------- FORMATS -------------------
+    # Each yields (line number, (title, artist, duration)) - unchecked
+
+    def _csv_rows(self, file):
+        reader = csv.reader(file)
+        first = next(reader, None)
+        if first is None:
+            return
+        header = [name.strip().lower() for name in first]
+        if {"title", "artist", "duration"} <= set(header):
+            columns = [header.index(name) for name in ("title", "artist", "duration")]
+        else:
+            # No header: first three columns, and the first row is a song
+            columns = [0, 1, 2]
+            yield 1, self._pick(first, columns)
+        for row in reader:
+            if row:
+                yield reader.line_num, self._pick(row, columns)
+
+    @staticmethod
+    def _pick(row, columns):
+        if len(row) <= max(columns):
+            return None, None, None
+        return tuple(row[column] for column in columns)
+
+    def _jsonl_rows(self, file):
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                song = json.loads(line)
+                yield line_number, (song.get("title"), song.get("artist"), song.get("duration"))
+            except (ValueError, AttributeError):
+                yield line_number, (None, None, None)   # Counted as a bad row
+
+    def _m3u_rows(self, file):
+        info = None     # Last #EXTINF line, waiting for its file line
+        for line_number, line in enumerate(file, 1):
+            line = line.strip()
+            if line.startswith("#EXTINF:"):
+                info = line[len("#EXTINF:"):]
+            elif line and not line.startswith("#"):
+                yield line_number, self._m3u_song(info, line)
+                info = None
+
+    @staticmethod
+    def _m3u_song(info, location):
+        """#EXTINF "seconds,Artist - Title" (or just the file name)"""
+        name = os.path.splitext(os.path.basename(location.replace("\\", "/")))[0]
+        seconds, artist, title = "0", "Unknown Artist", name
+        if info is not None:
+            seconds, _, label = info.partition(",")
+            seconds = seconds.split()[0] if seconds.strip() else "0"   # Parsed by m3u_seconds
+            if " - " in label:
+                artist, title = label.split(" - ", 1)
+            elif label.strip():
+                title = label
+        return title, artist, seconds
+
+
+# ------------------- LOADING INTO A PLAYLIST -------------------
+
+def import_steps(playlist, path, fmt=None, chunk_size=CHUNK_SIZE, strict=False):
+    """Load a file chunk by chunk - yields (added, skipped, progress) after each
+
+    The GUI runs one step per Tk callback, so the window stays responsive.
+    """
+    reader = SongReader(path, fmt, strict)
+    songs = iter(reader)
+    added = 0
+    while True:
+        count = playlist.add_songs(islice(songs, chunk_size))
+        added += count
+        if count < chunk_size:
+            break
+        yield added, reader.skipped, reader.progress()
+    yield added, reader.skipped, 1.0
+
+
+def import_file(playlist, path, fmt=None, chunk_size=CHUNK_SIZE, strict=False, progress=None):
+    """Load a whole file - returns (songs added, rows skipped)
+
+    progress(added, fraction) is called after every chunk.
+    """
+    added = skipped = 0
+    for added, skipped, fraction in import_steps(playlist, path, fmt, chunk_size, strict):
+        if progress is not None:
+            progress(added, fraction)
+    return added, skipped
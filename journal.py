@@ -0,0 +1,154 @@
+"""
+OPERATION JOURNAL (CRASH-SAFE HISTORY)
+Every change to the playlist is appended to a journal file as one line,
+e.g. ["add","Song","Artist",200]  ["next"]  ["type","Doubly Linked List"].
+
+- Appends are buffered and written + fsync'ed in batches
+  (every `batch_size` records or `sync_interval` seconds)
+- On startup: load the last checkpoint, then replay the journal
+- Checkpoint = full snapshot (utils/snapshot.py) + a fresh, empty journal
+
+The journal's first line names the checkpoint it continues from, so a
+crash in the middle of checkpointing never replays a change twice.
+"""
+import json
+import os
+import time
+from utils.snapshot import save_snapshot
+
+CHECKPOINT_EVERY = 10_000   # Records before the journal is compacted
+
+
+class Journal:
+    def __init__(self, path, batch_size=64, sync_interval=1.0,
+                 checkpoint_every=CHECKPOINT_EVERY):
+        self.path = path
+        self.batch_size = batch_size            # Records per write + fsync
+        self.sync_interval = sync_interval      # ... or seconds, whichever first
+        self.checkpoint_every = checkpoint_every
+        self.buffer = []                        # Encoded records not written yet
+        self.file = None                        # Opened on first write
+        self.last_sync = time.monotonic()
+        self.records = 0                        # Records since the checkpoint
+
+        # Which checkpoint does the journal on disk continue from?
+        self.generation = 0
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                header = self._decode(f.readline())
+            if header and header[0] == "checkpoint":
+                self.generation = header[1]
+
+    def checkpoint_path(self, generation=None):
+        """Snapshot file of a checkpoint generation"""
+        return f"{self.path}.{self.generation if generation is None else generation}.pls"
+
+    @staticmethod
+    def _encode(record):
+        return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+    @staticmethod
+    def _decode(line):
+        """Record from one line (None for a torn / damaged line)"""
+        if not line.endswith(b"\n"):
+            return None
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        return record if isinstance(record, list) and record else None
+
+    # ------------------- WRITING -------------------
+
+    def record(self, op, *args):
+        """Append one change (written with the next batch)"""
+        self.buffer.append(self._encode([op, *args]))
+        self.records += 1
+        if (len(self.buffer) >= self.batch_size
+                or time.monotonic() - self.last_sync >= self.sync_interval):
+            self.flush()
+
+    def needs_checkpoint(self):
+        """Has the journal grown enough to be compacted?"""
+        return self.records >= self.checkpoint_every
+
+    def flush(self):
+        """Write buffered records and fsync them to disk"""
+        self.last_sync = time.monotonic()
+        if not self.buffer:
+            return
+        if self.file is None:
+            new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            self.file = open(self.path, "ab")
+            if new_file:
+                self.file.write(self._encode(["checkpoint", self.generation]))
+        self.file.write(b"".join(self.buffer))
+        self.buffer = []
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        """Write what is left and close the file"""
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    # ------------------- CHECKPOINT -------------------
+
+    def checkpoint(self, playlist):
+        """Save the whole playlist and start an empty journal after it"""
+        self.close()
+        generation = self.generation + 1
+        save_snapshot(playlist, self.checkpoint_path(generation))
+
+        # Swapping in the new journal is the moment the checkpoint counts
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(self._encode(["checkpoint", generation]))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.path)
+        self._sync_directory()
+
+        old = self.checkpoint_path()
+        if os.path.exists(old):
+            os.remove(old)
+        self.generation = generation
+        self.records = 0
+
+    def _sync_directory(self):
+        """Make the rename itself durable (POSIX only)"""
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        fd = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    # ------------------- RECOVERY -------------------
+
+    def replay(self):
+        """Checkpoint path (or None) and the records written after it
+
+        A torn last line (crash while writing) is cut off the file.
+        """
+        checkpoint = self.checkpoint_path() if self.generation else None
+        if not os.path.exists(self.path):
+            return checkpoint, iter(())
+        return checkpoint, self._records()
+
+    def _records(self):
+        with open(self.path, "rb") as f:
+            f.readline()                        # Checkpoint line
+            good = f.tell()                     # Bytes holding complete records
+            for line in f:
+                record = self._decode(line)
+                if record is None:
+                    break
+                good += len(line)
+                self.records += 1
+                yield record
+        if good < os.path.getsize(self.path):
+            os.truncate(self.path, good)
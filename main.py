@@ -9,15 +9,73 @@ A visual simulation of different linked list data structures:
 
 Created for: Data Structures Project Submission
 """
-import tkinter as tk
-from tkinter import messagebox
-from gui import PlaylistApp
+import logging
+import sys
+from controller import PlaylistController, LoggingNotifier
+from utils.journal import Journal
+
+WELCOME_TEXT = """
+    🎵 WELCOME TO PLAYLIST MANAGER 🎵
+    
+    A Data Structures Simulation Project
+    
+    This application demonstrates three types of Linked Lists:
+    
+    1. SINGLY LINKED LIST
+       • Each node points only to next node
+       • Can only move forward
+       • Simple and memory efficient
+    
+    2. DOUBLY LINKED LIST  
+       • Each node points to both next AND previous
+       • Can move forward and backward
+       • More flexible but uses more memory
+    
+    3. CIRCULAR LINKED LIST
+       • Last node points back to first node
+       • Continuous loop navigation
+       • Perfect for playlists that repeat
+    
+    HOW TO USE:
+    1. Select a data structure type
+    2. Add songs using the form
+    3. Use playback controls
+    4. Watch the visualization update!
+    """
+
+HEADLESS_HELP = """Commands (one per line):
+    add Title | Artist | 3:20     next     prev     play     remove
+    clear     type Doubly Linked List     import songs.csv (.jsonl / .m3u)
+    save playlist.pls     open playlist.pls     seek 1:02:30     list     stats
+    find Que (songs whose title / artist starts with it)
+    shuffle     shuffle spread     shuffle play on / off     undo     redo
+    help     quit"""
 
 def main():
     """Main function to start the application"""
+    # --array = array-backed playlist engine
+    backend = "array" if "--array" in sys.argv else "linked"
+    
+    # --journal FILE = record every change, restore it on the next start
+    journal = None
+    if "--journal" in sys.argv[:-1]:
+        journal = Journal(sys.argv[sys.argv.index("--journal") + 1])
+    
+    if "--headless" in sys.argv:
+        run_headless(backend, journal=journal)
+        return
+    
+    # No display (or no Tk at all)? Keep working without a window
     try:
-        # Create main window
+        import tkinter as tk
         root = tk.Tk()
+    except Exception as e:
+        print(f"No display available ({e}) - starting in headless mode")
+        run_headless(backend, journal=journal)
+        return
+    
+    try:
+        from gui import PlaylistApp
         
         # Set window icon and title
         root.title("🎵 Playlist Manager - Data Structures Project")
@@ -32,52 +90,87 @@ def main():
         root.geometry(f'{width}x{height}+{x}+{y}')
         
         # Create the application
-        app = PlaylistApp(root)
+        app = PlaylistApp(root, backend=backend, journal=journal)
         
         # Show welcome message
-        show_welcome_message()
+        show_welcome_message(app)
         
         # Start the application
         root.mainloop()
         
     except Exception as e:
+        from tkinter import messagebox
         print(f"Error starting application: {e}")
         messagebox.showerror("Startup Error", 
             f"Cannot start application:\n{str(e)}\n\n"
             "Make sure all files are in correct folders.")
 
-def show_welcome_message():
-    """Show welcome message on startup"""
-    welcome_text = """
-    🎵 WELCOME TO PLAYLIST MANAGER 🎵
-    
-    A Data Structures Simulation Project
-    
-    This application demonstrates three types of Linked Lists:
-    
-    1. SINGLY LINKED LIST
-       • Each node points only to next node
-       • Can only move forward
-       • Simple and memory efficient
-    
-    2. DOUBLY LINKED LIST  
-       • Each node points to both next AND previous
-       • Can move forward and backward
-       • More flexible but uses more memory
+def show_welcome_message(app):
+    """Show welcome message on startup (console + status bar, no pop-up)"""
+    print(WELCOME_TEXT)
+    app.notify("Welcome", "Pick a data structure, add songs and watch the visualization update!")
+
+def run_headless(backend="linked", commands=None, journal=None):
+    """Run the playlist without a window, reading commands from stdin"""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    controller = PlaylistController(backend=backend, notifier=LoggingNotifier(), journal=journal)
+    if not controller.recover():
+        controller.add_sample_songs(3)
+    print(HEADLESS_HELP)
     
-    3. CIRCULAR LINKED LIST
-       • Last node points back to first node
-       • Continuous loop navigation
-       • Perfect for playlists that repeat
+    actions = {
+        "next": controller.next_song,
+        "prev": controller.prev_song,
+        "play": controller.play_current,
+        "remove": controller.remove_current,
+        "clear": controller.clear_playlist,
+        "undo": controller.undo,
+        "redo": controller.redo,
+    }
     
-    HOW TO USE:
-    1. Select a data structure type
-    2. Add songs using the form
-    3. Use playback controls
-    4. Watch the visualization update!
-    """
+    for line in (commands if commands is not None else sys.stdin):
+        command, _, argument = line.strip().partition(" ")
+        try:
+            if command in actions:
+                actions[command]()
+            elif command == "add":
+                title, artist, duration = (part.strip() for part in argument.split("|"))
+                controller.add_song(title, artist, duration)
+            elif command == "import":
+                controller.import_file(argument.strip())
+            elif command == "seek":
+                controller.seek(argument.strip())
+            elif command == "shuffle":
+                option = argument.split()
+                if option[:1] == ["play"]:
+                    controller.set_shuffle_play(option[1:] != ["off"])
+                else:
+                    controller.shuffle(spread=option == ["spread"])
+            elif command == "save":
+                controller.save(argument.strip())
+            elif command == "open":
+                controller.open(argument.strip())
+            elif command == "type":
+                controller.change_list_type(argument.strip())
+            elif command == "list":
+                for i, song in enumerate(controller.playlist.iter_range(0, 20)):
+                    mark = "▶" if song.is_current else " "
+                    print(f"{mark} #{i + 1} {song.title} - {song.artist} ({song.duration})")
+            elif command == "stats":
+                print(controller.playlist.get_stats())
+            elif command == "find":
+                for song in controller.search(argument):
+                    print(f"  #{controller.playlist.index_of(song) + 1} {song.title} - {song.artist}")
+            elif command == "help":
+                print(HEADLESS_HELP)
+            elif command in ("quit", "exit"):
+                break
+            elif command:
+                print(f"Unknown command: {command}")
+        except ValueError as e:
+            print(f"Error: {e}")
     
-    messagebox.showinfo("Playlist Manager - Data Structures Project", welcome_text)
+    controller.close()
 
 if __name__ == "__main__":
     print("Starting Playlist Manager...")
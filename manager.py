@@ -0,0 +1,168 @@
+"""
+PLAYLIST MANAGER (MANY PLAYLISTS, BOUNDED MEMORY)
+Serves many playlists from one process without keeping them all loaded:
+- get(playlist_id) returns the playlist's controller, loading it on a MISS
+  (from its snapshot file, or a new empty playlist)
+- Playlists are kept in least-recently-used order; while the estimated
+  memory of the loaded ones is over the budget, the coldest one is saved
+  as a snapshot (utils/snapshot.py) - only if it changed - and dropped;
+  one that cannot be saved is logged and stays loaded, the next one goes
+- hits / misses / evictions and resident bytes are counted (stats())
+
+Memory is estimated, not measured: a fixed cost per playlist plus a cost
+per song (measured with tracemalloc, including the index and position
+tree). Changes must go through the controller (its on_change marks the
+playlist for saving), and a controller must not be kept across get()
+calls - it may be evicted, and changes made to it afterwards are lost.
+"""
+import logging
+import os
+from collections import OrderedDict
+from urllib.parse import quote, unquote
+from controller import PlaylistController
+from utils.snapshot import save_snapshot, load_snapshot
+
+DEFAULT_BUDGET = 256 * 1024 * 1024      # Bytes
+PLAYLIST_BYTES = 2_500                  # Controller + empty playlist
+SONG_BYTES = {"linked": 770, "array": 510}
+EXTENSION = ".pls"
+
+log = logging.getLogger("playlist")
+
+
+class PlaylistManager:
+    def __init__(self, folder, memory_budget=DEFAULT_BUDGET, list_type="Singly Linked List",
+                 backend="linked", notifier=None):
+        self.folder = folder                    # Snapshot file per evicted playlist
+        self.memory_budget = memory_budget
+        self.list_type = list_type              # ... of new playlists
+        self.backend = backend
+        self.notifier = notifier                # Given to every controller
+        self.resident = OrderedDict()           # id -> controller, coldest first
+        self.sizes = {}                         # id -> estimated bytes (at its last use)
+        self.dirty = set()                      # Changed since loaded / saved
+        self.resident_bytes = 0
+        self.last = None                        # Handed out last (may have grown since)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.save_failures = 0
+        os.makedirs(folder, exist_ok=True)
+
+    def path(self, playlist_id):
+        """Snapshot file of a playlist (any id is a safe file name)"""
+        return os.path.join(self.folder, quote(playlist_id, safe="") + EXTENSION)
+
+    # ------------------- ACCESS -------------------
+
+    def get(self, playlist_id):
+        """Controller of `playlist_id` - loaded (or created) on a miss
+        (ids are file names: 7 and "7" are the same playlist)"""
+        playlist_id = str(playlist_id)
+        if self.last in self.resident:
+            self._measure(self.last)
+
+        controller = self.resident.get(playlist_id)
+        if controller is not None:
+            self.hits += 1
+            self.resident.move_to_end(playlist_id)
+        else:
+            self.misses += 1
+            controller = self.resident[playlist_id] = self._load(playlist_id)
+        self._measure(playlist_id)
+        self.last = playlist_id
+
+        self._enforce_budget()
+        return controller
+
+    def _load(self, playlist_id):
+        controller = PlaylistController(self.list_type, self.backend, self.notifier)
+        path = self.path(playlist_id)
+        if os.path.exists(path):
+            controller.playlist = load_snapshot(path, self.backend)
+        controller.on_change = lambda: self.dirty.add(playlist_id)
+        return controller
+
+    def __contains__(self, playlist_id):
+        playlist_id = str(playlist_id)
+        return playlist_id in self.resident or os.path.exists(self.path(playlist_id))
+
+    def ids(self):
+        """Ids of all playlists (loaded or on disk)"""
+        saved = {unquote(name[:-len(EXTENSION)]) for name in os.listdir(self.folder)
+                 if name.endswith(EXTENSION)}
+        return saved | set(self.resident)
+
+    # ------------------- MEMORY BUDGET -------------------
+
+    @staticmethod
+    def estimate(backend, songs):
+        """Estimated bytes of a loaded playlist with `songs` songs"""
+        return PLAYLIST_BYTES + songs * SONG_BYTES[backend]
+
+    def _measure(self, playlist_id):
+        """Update the estimate of one loaded playlist - O(1)"""
+        estimate = self.estimate(self.backend, self.resident[playlist_id].playlist.size)
+        self.resident_bytes += estimate - self.sizes.get(playlist_id, 0)
+        self.sizes[playlist_id] = estimate
+
+    def _enforce_budget(self):
+        """Evict the coldest playlists until the rest fit (the one just used
+        stays, and so does one that cannot be saved - the next one goes)"""
+        for playlist_id in list(self.resident)[:-1]:
+            if self.resident_bytes <= self.memory_budget:
+                return
+            self.evict(playlist_id)
+
+    def evict(self, playlist_id):
+        """Save a loaded playlist (if it changed) and drop it from memory
+        Returns False if it could not be saved (it stays loaded)."""
+        playlist_id = str(playlist_id)
+        if playlist_id in self.dirty and not self._save(playlist_id):
+            return False
+        del self.resident[playlist_id]
+        self.resident_bytes -= self.sizes.pop(playlist_id)
+        self.evictions += 1
+        return True
+
+    # ------------------- SAVING -------------------
+
+    def _save(self, playlist_id):
+        """Snapshot one loaded playlist - False (and logged) if that failed"""
+        try:
+            save_snapshot(self.resident[playlist_id].playlist, self.path(playlist_id))
+        except (OSError, ValueError, OverflowError) as e:
+            self.save_failures += 1
+            log.error("Saving playlist %r failed: %s", playlist_id, e)
+            return False
+        self.dirty.discard(playlist_id)
+        return True
+
+    def flush(self):
+        """Save every changed playlist (they stay loaded) - False if any
+        could not be saved (they stay marked as changed)"""
+        return all([self._save(playlist_id) for playlist_id in list(self.dirty)])
+
+    def delete(self, playlist_id):
+        """Forget a playlist, in memory and on disk"""
+        playlist_id = str(playlist_id)
+        if playlist_id in self.resident:
+            del self.resident[playlist_id]
+            self.resident_bytes -= self.sizes.pop(playlist_id)
+        self.dirty.discard(playlist_id)
+        if os.path.exists(self.path(playlist_id)):
+            os.remove(self.path(playlist_id))
+
+    def stats(self):
+        """Counters and memory use"""
+        lookups = self.hits + self.misses
+        return {
+            "resident": len(self.resident),
+            "resident_bytes": self.resident_bytes,
+            "memory_budget": self.memory_budget,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "save_failures": self.save_failures,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
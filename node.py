@@ -2,17 +2,87 @@
 SIMPLE SONG NODE STRUCTURE
 Each node = One song in playlist
 Contains: song data + pointers to next/prev songs
+
+Nodes use __slots__ (no per-node __dict__) so big playlists stay small:
+- SinglySongNode: only a next pointer (Singly Linked List)
+- SongNode: next AND prev pointers (Doubly / Circular Linked List)
 """
-class SongNode:
+import sys
+
+MAX_SECONDS = 0xFFFFFFFF    # Snapshots store lengths as unsigned 32-bit ints
+
+
+def parse_duration(duration):
+    """Convert "mm:ss" / "h:mm:ss" (or plain seconds) to integer seconds"""
+    if isinstance(duration, bool):      # An int to Python, never a length
+        raise ValueError(f"Invalid duration: {duration!r} (expected mm:ss)")
+    if isinstance(duration, int):
+        seconds = duration
+    else:
+        parts = [part.strip() for part in str(duration).strip().split(":")]
+        # Digits only (no signs); only the leading part may be 60 or more
+        if (not all(part.isdecimal() for part in parts)
+                or any(int(part) >= 60 for part in parts[1:])):
+            raise ValueError(f"Invalid duration: {duration!r} (expected mm:ss)")
+        seconds = 0
+        for part in parts:
+            seconds = seconds * 60 + int(part)
+
+    if seconds < 0:
+        raise ValueError(f"Invalid duration: {duration!r} (negative)")
+    if seconds > MAX_SECONDS:
+        raise ValueError(f"Invalid duration: {duration!r} (too long)")
+    return seconds
+
+
+def format_duration(seconds):
+    """Convert integer seconds back to "m:ss" """
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+class SinglySongNode:
+    __slots__ = ("title", "artist", "seconds", "song_id", "next", "is_current")
+
     def __init__(self, title, artist, duration):
         # Song data
-        self.title = title          # Song name
-        self.artist = artist        # Artist name  
-        self.duration = duration    # Song length (e.g., "3:45")
-        
-        # Pointers (connections to other nodes)
+        self.title = title                      # Song name
+        self.artist = sys.intern(artist)        # Artist name (shared string)
+        self.seconds = parse_duration(duration) # Song length in seconds
+        self.song_id = 0                        # Set by the playlist's index
+
+        # Pointer (connection to next node)
         self.next = None            # Points to next song
-        self.prev = None            # Points to previous song
-        
+
         # For visualization
         self.is_current = False     # Is this currently playing?
+
+    @property
+    def duration(self):
+        """Song length as "m:ss" (e.g., "3:45")"""
+        return format_duration(self.seconds)
+
+    @duration.setter
+    def duration(self, value):
+        self.seconds = parse_duration(value)
+
+
+class SongNode(SinglySongNode):
+    __slots__ = ("prev",)
+
+    def __init__(self, title, artist, duration):
+        super().__init__(title, artist, duration)
+        self.prev = None            # Points to previous song
+
+    @classmethod
+    def from_node(cls, node):
+        """Copy of a SinglySongNode (same song id) that has a prev pointer"""
+        new = cls.__new__(cls)      # Fields are already checked - skip __init__
+        new.title, new.artist, new.seconds = node.title, node.artist, node.seconds
+        new.song_id, new.next, new.is_current = node.song_id, node.next, node.is_current
+        new.prev = None
+        return new
+
+
+def node_bytes(node_class):
+    """Memory used by ONE node object (song strings not included)"""
+    return sys.getsizeof(node_class("", "", 0))
@@ -0,0 +1,35 @@
+"""
+GUI Notifier - shows controller messages in a status bar
+Non-modal: the app keeps running while the message is shown
+"""
+from tkinter import ttk
+
+class StatusBarNotifier:
+    COLORS = {"info": "darkgreen", "warning": "darkorange", "error": "red"}
+    ICONS = {"info": "ℹ", "warning": "⚠", "error": "✖"}
+
+    def __init__(self, parent, clear_after=5000):
+        self.parent = parent
+        self.clear_after = clear_after    # ms before the message fades out
+        self.clear_id = None
+
+        self.label = ttk.Label(parent, text="", font=("Arial", 9), anchor="w")
+
+    def grid(self, **options):
+        """Place the status bar (same options as any Tk widget)"""
+        self.label.grid(**options)
+
+    def notify(self, title, message, level="info"):
+        """Show a one-line message, replacing the previous one"""
+        text = f"{self.ICONS.get(level, '')} {title}: {message}".replace("\n", " ")
+        self.label.config(text=text, foreground=self.COLORS.get(level, "black"))
+
+        # Restart the fade-out timer
+        if self.clear_id is not None:
+            self.label.after_cancel(self.clear_id)
+        self.clear_id = self.label.after(self.clear_after, self.clear)
+
+    def clear(self):
+        """Hide the message"""
+        self.clear_id = None
+        self.label.config(text="")
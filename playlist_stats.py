@@ -0,0 +1,69 @@
+"""
+PLAYLIST STATISTICS (RUNNING TOTALS)
+Kept up to date on every add / remove, so get_stats never walks the list:
+- total playtime (seconds)
+- songs per artist
+- shortest / longest song
+"""
+from collections import Counter
+
+
+class PlaylistStats:
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Back to an empty playlist"""
+        self.total_seconds = 0
+        self.artists = Counter()    # artist -> number of songs
+        self.lengths = Counter()    # seconds -> number of songs
+        self.shortest = None        # Seconds of the shortest song
+        self.longest = None
+
+    def add(self, artist, seconds):
+        """One song added - O(1)"""
+        self.total_seconds += seconds
+        self.artists[artist] += 1
+        self.lengths[seconds] += 1
+        if self.shortest is None or seconds < self.shortest:
+            self.shortest = seconds
+        if self.longest is None or seconds > self.longest:
+            self.longest = seconds
+
+    def add_many(self, artists, seconds):
+        """Many songs added - `artists` = iterable of names (or {name: count}),
+        `seconds` = sequence of lengths; all counting runs in C"""
+        if not len(seconds):
+            return
+        self.artists.update(artists)
+
+        # Few distinct lengths: total / min / max come from the counts
+        lengths = Counter(seconds)
+        self.lengths.update(lengths)
+        self.total_seconds += sum(length * count for length, count in lengths.items())
+        self.shortest = min(lengths) if self.shortest is None else min(self.shortest, min(lengths))
+        self.longest = max(lengths) if self.longest is None else max(self.longest, max(lengths))
+
+    def remove(self, artist, seconds):
+        """One song removed - O(1), unless it was the last song of the
+        shortest/longest length (then the distinct lengths are scanned)"""
+        self.total_seconds -= seconds
+        self._take(self.artists, artist)
+        if self._take(self.lengths, seconds):
+            if seconds == self.shortest:
+                self.shortest = min(self.lengths, default=None)
+            if seconds == self.longest:
+                self.longest = max(self.lengths, default=None)
+
+    @staticmethod
+    def _take(counter, key):
+        """Count one less - True if none are left"""
+        counter[key] -= 1
+        if counter[key] <= 0:
+            del counter[key]
+            return True
+        return False
+
+    def songs_by(self, artist):
+        """Number of songs by this artist"""
+        return self.artists.get(artist, 0)
@@ -0,0 +1,214 @@
+"""
+POSITION TREE (ORDER-STATISTICS TREAP)
+Answers "which song is #i?" and "what number is this song?" in O(log n).
+
+A treap = binary search tree ordered by playlist POSITION
+          + random priorities that keep it balanced.
+Each tree node remembers how many songs are under it (count),
+so position i can be found by going left/right using the counts.
+
+The same trick with song LENGTHS (total = seconds under a tree node)
+answers "which song plays T seconds in?" in O(log n) too.
+"""
+import random
+
+
+class _Slot:
+    """One tree node = one song"""
+    __slots__ = ("key", "song", "seconds", "priority", "count", "total",
+                 "left", "right", "parent")
+
+    def __init__(self, key, song, seconds=0):
+        self.key = key                  # Song id
+        self.song = song                # The node (or array row)
+        self.seconds = seconds          # Song length
+        self.priority = random.random()
+        self.count = 1                  # Songs in this subtree
+        self.total = seconds            # Seconds of all songs in this subtree
+        self.left = None
+        self.right = None
+        self.parent = None
+
+
+def _count(slot):
+    return slot.count if slot else 0
+
+
+def _total(slot):
+    return slot.total if slot else 0
+
+
+def _update(slot):
+    """Recompute count / total and fix children's parent pointers"""
+    slot.count = 1 + _count(slot.left) + _count(slot.right)
+    slot.total = slot.seconds + _total(slot.left) + _total(slot.right)
+    if slot.left:
+        slot.left.parent = slot
+    if slot.right:
+        slot.right.parent = slot
+
+
+def _merge(first, second):
+    """Join two trees (every song of `first` comes before `second`)"""
+    if first is None:
+        return second
+    if second is None:
+        return first
+    if first.priority > second.priority:
+        first.right = _merge(first.right, second)
+        _update(first)
+        return first
+    second.left = _merge(first, second.left)
+    _update(second)
+    return second
+
+
+def _split(slot, k):
+    """Cut a tree into (first k songs, the rest)"""
+    if slot is None:
+        return None, None
+    if _count(slot.left) < k:
+        left, right = _split(slot.right, k - _count(slot.left) - 1)
+        slot.right = left
+        _update(slot)
+        return slot, right
+    left, right = _split(slot.left, k)
+    slot.left = right
+    _update(slot)
+    return left, slot
+
+
+class PositionTree:
+    def __init__(self):
+        self.root = None
+        self.slots = {}     # song id -> tree node
+
+    def __len__(self):
+        return _count(self.root)
+
+    @classmethod
+    def build(cls, songs):
+        """Build from (song_id, song, seconds) in playlist order - O(n)"""
+        tree = cls()
+        stack = []      # Right spine of the tree built so far
+        for key, song, seconds in songs:
+            slot = _Slot(key, song, seconds)
+            tree.slots[key] = slot
+
+            # Pop spine nodes with lower priority: they become our left child
+            last = None
+            while stack and stack[-1].priority < slot.priority:
+                last = stack.pop()
+            slot.left = last
+            if last:
+                last.parent = slot
+            if stack:
+                stack[-1].right = slot
+                slot.parent = stack[-1]
+            stack.append(slot)
+
+        if stack:
+            tree.root = stack[0]
+            tree._recount(tree.root)
+        return tree
+
+    def _recount(self, root):
+        """Fix every count / total bottom-up (after build)"""
+        order = []
+        todo = [root]
+        while todo:
+            slot = todo.pop()
+            order.append(slot)
+            if slot.left:
+                todo.append(slot.left)
+            if slot.right:
+                todo.append(slot.right)
+        for slot in reversed(order):
+            slot.count = 1 + _count(slot.left) + _count(slot.right)
+            slot.total = slot.seconds + _total(slot.left) + _total(slot.right)
+
+    # ------------------- UPDATES -------------------
+
+    def insert(self, position, key, song, seconds=0):
+        """Put a song at `position` (0 = first)"""
+        slot = _Slot(key, song, seconds)
+        self.slots[key] = slot
+        left, right = _split(self.root, position)
+        self.root = _merge(_merge(left, slot), right)
+        self.root.parent = None
+
+    def append(self, key, song, seconds=0):
+        """Put a song at the end"""
+        self.insert(len(self), key, song, seconds)
+
+    def replace(self, key, song):
+        """Same position, new node object for this song id"""
+        self.slots[key].song = song
+
+    def remove(self, key):
+        """Take a song out"""
+        position = self.index_of(key)
+        left, right = _split(self.root, position)
+        _, right = _split(right, 1)
+        self.root = _merge(left, right)
+        if self.root:
+            self.root.parent = None
+        del self.slots[key]
+
+    # ------------------- QUERIES -------------------
+
+    def song_at(self, position):
+        """Song at `position` (0 = first)"""
+        if not 0 <= position < len(self):
+            raise IndexError(f"No song at position {position}")
+        slot = self.root
+        while True:
+            left = _count(slot.left)
+            if position < left:
+                slot = slot.left
+            elif position == left:
+                return slot.song
+            else:
+                position -= left + 1
+                slot = slot.right
+
+    def index_of(self, key):
+        """Position of the song with this id (walk up to the root)"""
+        slot = self.slots[key]
+        position = _count(slot.left)
+        while slot.parent:
+            if slot is slot.parent.right:
+                position += _count(slot.parent.left) + 1
+            slot = slot.parent
+        return position
+
+    # ------------------- PLAYTIME -------------------
+
+    def total_seconds(self):
+        """Length of the whole playlist"""
+        return _total(self.root)
+
+    def at_time(self, seconds):
+        """(song, seconds into it) playing `seconds` after the first song starts"""
+        if not 0 <= seconds < _total(self.root):
+            raise IndexError(f"No song playing at {seconds} seconds")
+        slot = self.root
+        while True:
+            left = _total(slot.left)
+            if seconds < left:
+                slot = slot.left
+            elif seconds < left + slot.seconds:
+                return slot.song, seconds - left
+            else:
+                seconds -= left + slot.seconds
+                slot = slot.right
+
+    def time_before(self, key):
+        """Seconds of all songs before the song with this id"""
+        slot = self.slots[key]
+        seconds = _total(slot.left)
+        while slot.parent:
+            if slot is slot.parent.right:
+                seconds += _total(slot.parent.left) + slot.parent.seconds
+            slot = slot.parent
+        return seconds
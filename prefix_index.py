@@ -0,0 +1,123 @@
+"""
+PREFIX INDEX (TYPE-AHEAD SEARCH)
+Every title and artist, lower-cased, in sorted order - cut into blocks:
+    blocks = [[("abba", 7), ("abc", 2), ...], [("queen", 4), ...], ...]
+    maxes  = [last entry of each block]
+- search("que"): binary search to the first entry >= "que", then read
+  entries while they start with it - O(log n + results)
+- add / remove: binary search for the block, insert / delete inside it -
+  O(log n + BLOCK); a block that grows too big is split in two
+
+A sorted index instead of a trie: two tuples per song instead of a node
+per letter, so millions of songs still fit. Entries hold song ids (not
+nodes), so relinking, shuffling or changing the list type never touch it.
+"""
+from bisect import bisect_left, insort
+
+BLOCK = 256     # Entries per block after a split (split at twice that)
+
+
+def _keys(title, artist):
+    """Searchable texts of a song (the artist once if it equals the title)"""
+    title, artist = title.casefold(), artist.casefold()
+    return (title,) if title == artist else (title, artist)
+
+
+class PrefixIndex:
+    def __init__(self):
+        self.blocks = []        # Sorted lists of (text, song id)
+        self.maxes = []         # Last entry of each block (for the binary search)
+        self.size = 0           # Entries (one or two per song)
+
+    @classmethod
+    def build(cls, songs):
+        """Index of (song_id, title, artist) songs - one sort, O(n log n)"""
+        index = cls()
+        index._fill(sorted((key, song_id) for song_id, title, artist in songs
+                           for key in _keys(title, artist)))
+        return index
+
+    def _fill(self, entries):
+        """Cut sorted entries into blocks"""
+        self.blocks = [entries[i:i + BLOCK] for i in range(0, len(entries), BLOCK)]
+        self.maxes = [block[-1] for block in self.blocks]
+        self.size = len(entries)
+
+    # ------------------- UPDATES -------------------
+
+    def add(self, song_id, title, artist):
+        for key in _keys(title, artist):
+            self._insert((key, song_id))
+
+    def add_many(self, songs):
+        """Add (song_id, title, artist) songs - a big batch is merged in one pass"""
+        entries = sorted((key, song_id) for song_id, title, artist in songs
+                         for key in _keys(title, artist))
+        if len(entries) * 8 < self.size:
+            for entry in entries:
+                self._insert(entry)
+            return
+        # Two sorted runs: the sort only merges them - O(n)
+        merged = [entry for block in self.blocks for entry in block]
+        merged += entries
+        merged.sort()
+        self._fill(merged)
+
+    def _insert(self, entry):
+        if not self.blocks:
+            self.blocks.append([entry])
+            self.maxes.append(entry)
+            self.size = 1
+            return
+        i = min(bisect_left(self.maxes, entry), len(self.blocks) - 1)
+        block = self.blocks[i]
+        insort(block, entry)
+        self.maxes[i] = block[-1]
+        if len(block) > 2 * BLOCK:
+            self.blocks[i:i + 1] = [block[:BLOCK], block[BLOCK:]]
+            self.maxes[i:i + 1] = [block[BLOCK - 1], block[-1]]
+        self.size += 1
+
+    def remove(self, song_id, title, artist):
+        for key in _keys(title, artist):
+            self._delete((key, song_id))
+
+    def _delete(self, entry):
+        i = bisect_left(self.maxes, entry)
+        if i == len(self.blocks):
+            return
+        block = self.blocks[i]
+        j = bisect_left(block, entry)
+        if j == len(block) or block[j] != entry:
+            return
+        del block[j]
+        self.size -= 1
+        if block:
+            self.maxes[i] = block[-1]
+        else:
+            del self.blocks[i]
+            del self.maxes[i]
+
+    # ------------------- SEARCH -------------------
+
+    def search(self, prefix, limit=10):
+        """Ids of up to `limit` songs whose title or artist starts with
+        `prefix` (any case), in alphabetical order of the matching text"""
+        prefix = prefix.casefold()
+        start = (prefix,)               # Sorts before every (prefix..., id)
+        found = {}                      # song id -> None (ordered, no repeats)
+        i = bisect_left(self.maxes, start)
+        j = bisect_left(self.blocks[i], start) if i < len(self.blocks) else 0
+        while i < len(self.blocks) and len(found) < limit:
+            block = self.blocks[i]
+            while j < len(block):
+                key, song_id = block[j]
+                if not key.startswith(prefix):
+                    return list(found)
+                found[song_id] = None
+                if len(found) == limit:
+                    return list(found)
+                j += 1
+            i += 1
+            j = 0
+        return list(found)
@@ -0,0 +1,304 @@
+"""
+🌐 PLAYLIST SERVER (ASYNCIO, JSON LINES)
+Lets other processes on the same machine drive playlists: one event loop
+serves thousands of connections, no threads.
+
+Run from the project folder:
+    python server.py                          # Unix socket ./playlist.sock
+    python server.py --socket /tmp/pl.sock --array
+    python server.py --port 8765              # TCP on 127.0.0.1 only
+    python server.py --data-dir playlists --memory 64
+                                              # many playlists, 64 MB loaded at most
+
+Protocol: one JSON object per line in each direction, answers in order:
+    {"op": "add", "title": "Song", "artist": "Artist", "duration": "3:20"}
+    {"ok": true, "song": {"id": 4, "title": "Song", "artist": "Artist", ...}}
+    {"op": "list", "offset": 0, "limit": 20}
+    {"ok": true, "total": 5, "offset": 0, "songs": [...]}
+Ops: add, remove, next, prev, current, stats, list, status (server counters).
+A request may name its "playlist" (default "default") - every name is a
+playlist of its own, created on first use. An "id" field is echoed back.
+With --data-dir the playlists live in a PlaylistManager (manager.py): cold
+ones are saved there and dropped from memory, and survive a restart.
+Failures answer {"ok": false, "error": "..."}.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+from controller import PlaylistController
+from manager import DEFAULT_BUDGET, PlaylistManager
+
+DEFAULT_SOCKET = "playlist.sock"
+DEFAULT_PORT = 8765
+LIST_LIMIT = 500            # Songs per "list" page at most
+LINE_LIMIT = 64 * 1024      # Longest request line (bytes)
+
+
+def song_json(song):
+    """A song as sent to clients"""
+    return {"id": song.song_id, "title": song.title, "artist": song.artist,
+            "duration": song.duration, "seconds": song.seconds}
+
+
+def _encode(reply):
+    return (json.dumps(reply, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class ProblemNotifier:
+    """Keeps the last warning / error the controller sent (it becomes the
+    reply's error), drops everything else"""
+
+    def __init__(self):
+        self.problem = None
+
+    def notify(self, title, message, level="info"):
+        if level != "info":
+            self.problem = message
+
+
+# ------------------- SERVICE (NO NETWORKING) -------------------
+
+class PlaylistService:
+    """Answers JSON requests for many named playlists"""
+
+    def __init__(self, list_type="Singly Linked List", backend="linked",
+                 data_dir=None, memory_budget=DEFAULT_BUDGET):
+        self.list_type = list_type
+        self.backend = backend
+        self.notifier = ProblemNotifier()
+        self.controllers = {}               # Playlist name -> PlaylistController
+        self.manager = None                 # ... or kept here, within a memory budget
+        if data_dir is not None:
+            self.manager = PlaylistManager(data_dir, memory_budget, list_type, backend,
+                                           self.notifier)
+        self.requests = 0
+        self.connections = 0
+
+    def controller(self, name):
+        """Controller of playlist `name` (a new, empty one the first time)"""
+        if self.manager is not None:
+            return self.manager.get(name)
+        controller = self.controllers.get(name)
+        if controller is None:
+            controller = PlaylistController(self.list_type, self.backend, self.notifier)
+            self.controllers[name] = controller
+        return controller
+
+    def answer(self, request):
+        """Reply (a dict) to one decoded request"""
+        self.requests += 1
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "request must be a JSON object"}
+        name = request.get("op")
+        op = self.OPS.get(name) if isinstance(name, str) else None   # ["add"] is unhashable
+        self.notifier.problem = None
+        if op is None:
+            reply = {"ok": False, "error": f"unknown op: {request.get('op')!r}"}
+        else:
+            try:
+                controller = None if op is PlaylistService.op_status else \
+                    self.controller(str(request.get("playlist", "default")))
+                reply = op(self, controller, request)
+            except (ValueError, TypeError, IndexError, OverflowError) as e:
+                reply = {"ok": False, "error": str(e)}     # Overflow: int(1e999)
+            except OSError as e:               # Loading / evicting a playlist file
+                reply = {"ok": False, "error": f"storage error: {e}"}
+            else:
+                if self.notifier.problem is not None:
+                    reply = {"ok": False, "error": self.notifier.problem}
+        if "id" in request:
+            reply["id"] = request["id"]
+        return reply
+
+    # ------------------- OPS -------------------
+    # Each gets (controller, request) and returns the reply
+
+    def op_add(self, controller, request):
+        title, artist = request.get("title"), request.get("artist")
+        # Checked before anything is linked (the index hashes them, snapshots encode them)
+        if not (isinstance(title, str) and title and isinstance(artist, str) and artist):
+            raise ValueError("title and artist must be non-empty strings")
+        song = controller.add_song(title, artist, request.get("duration"))
+        if song is None:
+            raise ValueError("add needs title, artist and duration")
+        return {"ok": True, "song": song_json(song)}
+
+    def _current(self, controller):
+        song = controller.playlist.current
+        return {"ok": True, "song": song_json(song) if song else None}
+
+    def op_remove(self, controller, request):
+        controller.remove_current()
+        return self._current(controller)
+
+    def op_next(self, controller, request):
+        controller.next_song()
+        return self._current(controller)
+
+    def op_prev(self, controller, request):
+        controller.prev_song()
+        return self._current(controller)
+
+    def op_current(self, controller, request):
+        return self._current(controller)
+
+    def op_stats(self, controller, request):
+        return {"ok": True, "stats": controller.playlist.get_stats()}
+
+    def op_status(self, controller, request):
+        """Server counters (no playlist needed - `controller` is None)"""
+        return {"ok": True, "requests": self.requests, "connections": self.connections,
+                "playlists": self.manager.stats() if self.manager else
+                {"resident": len(self.controllers)}}
+
+    def op_list(self, controller, request):
+        """One page of songs - O(log n + limit), the list is never copied"""
+        offset = int(request.get("offset", 0))
+        limit = min(int(request.get("limit", 20)), LIST_LIMIT)
+        if offset < 0 or limit < 0:
+            raise ValueError("offset and limit must not be negative")
+        playlist = controller.playlist
+        songs = []
+        for song in playlist.iter_range(offset, limit):
+            songs.append(song_json(song))
+            songs[-1]["current"] = song.is_current
+        return {"ok": True, "total": playlist.size, "offset": offset, "songs": songs}
+
+    OPS = {
+        "add": op_add,
+        "remove": op_remove,
+        "next": op_next,
+        "prev": op_prev,
+        "current": op_current,
+        "stats": op_stats,
+        "list": op_list,
+        "status": op_status,
+    }
+
+    def close(self):
+        """Save what the manager holds (nothing to do without one)"""
+        if self.manager is not None:
+            self.manager.flush()
+
+    # ------------------- CONNECTIONS -------------------
+
+    async def handle(self, reader, writer):
+        """One client: read a line, answer it, until the client hangs up"""
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:              # Longer than LINE_LIMIT
+                    writer.write(_encode({"ok": False, "error": "request too long"}))
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    reply = {"ok": False, "error": "request is not valid JSON"}
+                else:
+                    reply = self.answer(request)
+                writer.write(_encode(reply))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+
+# ------------------- SERVER / CLIENT -------------------
+
+def default_address():
+    """Unix socket where there are Unix sockets, else localhost TCP"""
+    return DEFAULT_SOCKET if hasattr(socket, "AF_UNIX") else ("127.0.0.1", DEFAULT_PORT)
+
+
+async def start_server(service, address):
+    """Listen on a Unix socket path or a (host, port) pair"""
+    if isinstance(address, tuple):
+        return await asyncio.start_server(service.handle, *address, limit=LINE_LIMIT,
+                                          backlog=4096)
+    if os.path.exists(address):
+        os.remove(address)                      # Left over from an earlier run
+    return await asyncio.start_unix_server(service.handle, address, limit=LINE_LIMIT,
+                                           backlog=4096)
+
+
+class PlaylistClient:
+    """Talks to a running server:
+
+        client = await PlaylistClient.connect("playlist.sock")
+        song = (await client.call("add", title="A", artist="B", duration="3:00"))["song"]
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, address):
+        if isinstance(address, tuple):
+            reader, writer = await asyncio.open_connection(*address, limit=LINE_LIMIT)
+        else:
+            reader, writer = await asyncio.open_unix_connection(address, limit=LINE_LIMIT)
+        return cls(reader, writer)
+
+    async def call(self, op, **fields):
+        """Send one request and wait for its reply"""
+        self.writer.write(_encode({"op": op, **fields}))
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        return json.loads(line)
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def serve(address, service):
+    """Run the server until cancelled (Ctrl+C)"""
+    server = await start_server(service, address)
+    where = f"{address[0]}:{address[1]}" if isinstance(address, tuple) else address
+    print(f"Playlist server listening on {where}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+        if not isinstance(address, tuple) and os.path.exists(address):
+            os.remove(address)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Playlist server (JSON lines)")
+    parser.add_argument("--socket", help=f"Unix socket path (default: {DEFAULT_SOCKET})")
+    parser.add_argument("--port", type=int, help="listen on 127.0.0.1:PORT instead")
+    parser.add_argument("--type", default="Singly Linked List",
+                        help="list type of new playlists")
+    parser.add_argument("--array", action="store_true", help="array-backed playlists")
+    parser.add_argument("--data-dir", help="keep playlists in this folder (saved, evicted when cold)")
+    parser.add_argument("--memory", type=float, default=DEFAULT_BUDGET / 2 ** 20,
+                        help="MB of playlists kept loaded with --data-dir (default: %(default)g)")
+    args = parser.parse_args(argv)
+
+    address = args.socket or default_address()
+    if args.port is not None:
+        address = ("127.0.0.1", args.port)
+    service = PlaylistService(args.type, "array" if args.array else "linked",
+                              args.data_dir, int(args.memory * 2 ** 20))
+    try:
+        asyncio.run(serve(address, service))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
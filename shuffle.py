@@ -0,0 +1,54 @@
+"""
+SHUFFLE (NO COPY OF THE PLAYLIST)
+Three ways to play the songs in random order:
+- playlist.shuffle():  the SAME nodes / rows are relinked in random order - O(n)
+- playlist.shuffled(): random order drawn one song at a time, the links
+                       are never touched (lazy Fisher-Yates over positions)
+- spread=True:         no artist twice in a row (whenever that is possible)
+"""
+import heapq
+import random
+
+
+def random_order(size, rng=random):
+    """Positions 0 .. size-1 in random order, one at a time
+
+    Fisher-Yates on a virtual array: only the positions swapped so far are
+    stored, so starting costs nothing and memory grows with songs played.
+    """
+    moved = {}      # position -> value swapped into it
+    for i in range(size):
+        j = rng.randrange(i, size)
+        picked = moved.pop(j, j)
+        if j != i:
+            moved[j] = moved.pop(i, i)
+        yield picked
+
+
+def spread_artists(songs, rng=random):
+    """Songs in random order with the same artist never back to back
+    (unless one artist has more than half of them) - O(n log artists)"""
+    # 1. Songs per artist, in random order inside each artist
+    by_artist = {}
+    for song in songs:
+        by_artist.setdefault(song.artist, []).append(song)
+    for group in by_artist.values():
+        rng.shuffle(group)
+
+    # 2. Always play the artist with the most songs left (ties at random),
+    #    except the one just played - it waits out one turn
+    heap = [(-len(group), rng.random(), artist) for artist, group in by_artist.items()]
+    heapq.heapify(heap)
+    order = []
+    waiting = None
+    while heap:
+        left, _, artist = heapq.heappop(heap)
+        order.append(by_artist[artist].pop())
+        if waiting is not None:
+            heapq.heappush(heap, waiting)
+        waiting = (left + 1, rng.random(), artist) if left + 1 else None
+
+    # 3. Only one artist left: its songs cannot be kept apart
+    if waiting is not None:
+        order.extend(by_artist[waiting[2]])
+    return order
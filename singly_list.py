@@ -3,25 +3,69 @@ SINGLY LINKED LIST
 Each node points only to NEXT node
 Simple forward-only navigation
 """
-from .node import SongNode
+import gc
+import random
+from itertools import islice
+from .node import SinglySongNode, node_bytes
+from .song_index import SongIndex
+from .position_tree import PositionTree
+from .playlist_stats import PlaylistStats
+from .prefix_index import PrefixIndex
+from .shuffle import random_order, spread_artists
 
 class SinglyLinkedList:
+    # Node type used by this list (no prev pointer needed)
+    node_class = SinglySongNode
+
     def __init__(self):
         # Basic pointers
         self.head = None      # First song
         self.tail = None      # Last song
-        self.current = None   # Now playing
+        self._current = None  # Now playing (set through .current)
+        self.before_current = None  # Song just BEFORE current (for O(1) remove)
         self.size = 0         # Song count
         
+        # Hash index: id / title / artist -> songs
+        self.index = SongIndex()
+        
+        # Position tree (built on first positional query, then kept in sync)
+        self.positions = None
+        
+        # Prefix index of titles / artists (built on first search, then kept in sync)
+        self.prefixes = None
+        
+        # Running totals (playtime, songs per artist, shortest / longest)
+        self.stats = PlaylistStats()
+        
         # For explanation
         self.list_type = "Singly Linked List"
     
+    # ------------------- NOW PLAYING -------------------
+    
+    @property
+    def current(self):
+        """Song that is playing now"""
+        return self._current
+    
+    @current.setter
+    def current(self, song):
+        """Move the "now playing" mark - only the old and new node change"""
+        if self._current is not None:
+            self._current.is_current = False
+        if song is not None:
+            song.is_current = True
+        self._current = song
+    
+    def is_playing(self, song):
+        """Is this the current song? - O(1)"""
+        return song is not None and song is self._current
+    
     # ------------------- BASIC OPERATIONS -------------------
     
     def add_song(self, title, artist, duration):
         """Add song to END of playlist"""
         # 1. Create new node
-        new_song = SongNode(title, artist, duration)
+        new_song = self.node_class(title, artist, duration)
         
         # 2. If playlist is empty
         if self.head is None:
@@ -36,46 +80,456 @@ class SinglyLinkedList:
         
         # 5. Increase size
         self.size += 1
+        self._song_added(new_song)
         
         return new_song
     
+    def add_songs(self, songs):
+        """Add many (title, artist, duration) songs to the END in one pass"""
+        # 1. Build the new nodes as a separate chain (playlist not touched yet)
+        node_class = self.node_class
+        two_way = hasattr(node_class, "prev")
+        first = last = None
+        count = 0
+        
+        # Pause the garbage collector: a million new nodes would trigger it
+        # again and again although none of them is garbage
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for title, artist, duration in songs:
+                song = node_class(title, artist, duration)
+                if last is None:
+                    first = song
+                else:
+                    last.next = song
+                    if two_way:
+                        song.prev = last
+                last = song
+                count += 1
+        finally:
+            # 2. Hook the whole chain on at once (songs before a bad one are kept)
+            if first is not None:
+                self._attach_chain(first, last, count)
+            if gc_was_enabled:
+                gc.enable()
+        
+        return count
+    
+    @classmethod
+    def from_iterable(cls, songs):
+        """New playlist filled with (title, artist, duration) songs"""
+        playlist = cls()
+        playlist.add_songs(songs)
+        return playlist
+    
+    def _attach_chain(self, first, last, count):
+        """Link a ready-made chain first..last after tail - one size update"""
+        if self.head is None:
+            self.head = first
+            self.current = first
+        else:
+            self.tail.next = first
+        self.tail = last
+        
+        self.size += count
+        self._songs_added(first, count)
+    
     def remove_current(self):
         """Remove the currently playing song"""
         # 1. Check if playlist is empty
         if self.current is None:
             return None
         
-        # 2. Special case: Removing the first song
-        if self.head == self.current:
-            self.head = self.current.next
-        else:
-            # 3. Find the song BEFORE current
-            temp = self.head
-            while temp and temp.next != self.current:
-                temp = temp.next
-            
-            # 4. Skip current song (connect prev to next)
-            if temp:
-                temp.next = self.current.next
+        # 2. Song BEFORE current (kept up to date by next_song)
+        before = self.find_before_current()
+        removed = self.current
+        following = removed.next
         
-        # 5. Move current to next song (or to head if none)
-        self.current = self.current.next or self.head
+        # 3. Skip current song (connect before to next)
+        self._unlink(removed, before)
         
-        # 6. Decrease size
-        self.size -= 1
+        # 4. Move current to next song (or to head if none)
+        if following:
+            self.current = following    # same song is still "before" it
+        else:
+            self.current = self.head
+            self.before_current = None
         
         return self.current
     
+    def _unlink(self, song, before):
+        """Take `song` out of the chain (`before` = song before it, or None)"""
+        if before is None:
+            self.head = song.next
+        else:
+            before.next = song.next
+        if self.tail is song:
+            self.tail = before
+        if self.before_current is song:
+            self.before_current = before
+        song.next = None
+        
+        self.size -= 1
+        self._song_removed(song)
+    
+    def _link_after(self, before, song):
+        """Hook `song` in after `before` (None = new head), list not empty"""
+        if before is None:
+            song.next = self.head
+            self.head = song
+        else:
+            song.next = before.next
+            before.next = song
+        if song.next is None:
+            self.tail = song
+        if song.next is self.current:
+            self.before_current = song
+    
     def next_song(self):
         """Move to next song"""
         if self.current and self.current.next:
+            self.before_current = self.current
             self.current = self.current.next
         return self.current
     
+    def find_before_current(self):
+        """Song BEFORE current - O(1) normally, walks only if the hint is stale"""
+        before = self.before_current
+        
+        # Hint still valid? (current may have been set from outside)
+        if self.head is self.current:
+            self.before_current = None
+            return None
+        if before is not None and before.next is self.current:
+            return before
+        
+        # Fallback: ask the position tree, or walk from head
+        if self.positions is not None:
+            position = self.index_of(self.current)
+            before = self.song_at(position - 1) if position > 0 else None
+            self.before_current = before
+            return before
+        before = self.head
+        while before and before.next is not self.current:
+            before = before.next
+        self.before_current = before
+        return before
+    
     def prev_song(self):
         """Cannot go back in singly linked list"""
         return self.current  # Stay on same song
     
+    # ------------------- CHANGING TYPE IN PLACE -------------------
+    
+    def convert_to(self, list_type):
+        """Turn this playlist into another linked list type WITHOUT copying:
+        the same nodes are relinked, index / positions / current are kept"""
+        from .doubly_list import DoublyLinkedList
+        from .circular_list import CircularLinkedList
+        classes = {
+            "Singly Linked List": SinglyLinkedList,
+            "Doubly Linked List": DoublyLinkedList,
+            "Circular Linked List": CircularLinkedList,
+        }
+        # Checked before anything is relinked (a ring would be left open)
+        if list_type not in classes:
+            raise ValueError(f"Unknown list type: {list_type!r}")
+        if list_type == self.list_type:
+            return self
+        
+        # 1. Straight chain head -> tail first (tail.next = None)
+        self._open_ring()
+        had_prev = isinstance(self, DoublyLinkedList)   # prev pointers already right
+        
+        # 2. Same object, new behaviour - then fix the links the new type needs
+        self.__class__ = classes[list_type]
+        self.list_type = list_type
+        self._relink(had_prev)
+        return self
+    
+    def _open_ring(self):
+        """Nothing to open: a singly list already ends at tail"""
+    
+    def _relink(self, had_prev):
+        """Singly needs no prev pointers - only remember the song before current"""
+        self.before_current = getattr(self.current, "prev", None)
+    
+    # ------------------- BOOKKEEPING -------------------
+    
+    def _song_added(self, song, position=None, keep_id=False):
+        """New song linked in: give it an id, update index and positions"""
+        if not keep_id:
+            song.song_id = self.index.new_id()
+        self.index.add(song.song_id, song.title, song.artist, song)
+        self.stats.add(song.artist, song.seconds)
+        if self.prefixes is not None:
+            self.prefixes.add(song.song_id, song.title, song.artist)
+        if self.positions is not None:
+            if position is None:
+                self.positions.append(song.song_id, song, song.seconds)
+            else:
+                self.positions.insert(position, song.song_id, song, song.seconds)
+    
+    def _songs_added(self, first, count):
+        """`count` songs linked in from `first` on: ids, index, positions"""
+        ids = self.index.add_many((song.title, song.artist, song)
+                                  for song in self.iter_from(first, count))
+        positions = self.positions
+        stats = self.stats
+        song = first
+        for song_id in ids:
+            song.song_id = song_id
+            stats.add(song.artist, song.seconds)
+            if positions is not None:
+                positions.append(song_id, song, song.seconds)
+            song = song.next
+        if self.prefixes is not None:
+            self.prefixes.add_many((song.song_id, song.title, song.artist)
+                                   for song in self.iter_from(first, count))
+    
+    def _song_removed(self, song):
+        """Song unlinked: forget it in index and positions"""
+        self.index.remove(song.song_id, song.title, song.artist)
+        self.stats.remove(song.artist, song.seconds)
+        if self.prefixes is not None:
+            self.prefixes.remove(song.song_id, song.title, song.artist)
+        if self.positions is not None:
+            self.positions.remove(song.song_id)
+    
+    # ------------------- LOOKUP (HASH INDEX) -------------------
+    
+    def get_song(self, song_id):
+        """Find song by its id - O(1)"""
+        return self.index.get(song_id)
+    
+    def find_songs(self, title=None, artist=None):
+        """All songs with this title and/or artist (duplicates included)"""
+        return self.index.find(title, artist)
+    
+    def jump_to(self, song_id=None, title=None, artist=None):
+        """Make a song current - by id, or the first title/artist match
+        
+        The O(1) remove hint (song before current) is refreshed from the
+        position tree when it is built - O(log n). Without the tree the next
+        remove_current on a singly list walks from head to find it - O(n).
+        """
+        if song_id is not None:
+            song = self.index.get(song_id)
+        else:
+            song = self.index.first(title, artist)
+        
+        if song is not None:
+            if self.positions is not None:
+                self.before_current = self._before(song)
+            self.current = song
+        return song
+    
+    # ------------------- TYPE-AHEAD SEARCH (PREFIX INDEX) -------------------
+    
+    def search(self, prefix, limit=10):
+        """Up to `limit` songs whose title or artist starts with `prefix`
+        (any case), alphabetical - O(log n + limit) once the index is built"""
+        if self.prefixes is None:
+            self.prefixes = PrefixIndex.build(
+                (s.song_id, s.title, s.artist) for s in self.iter_songs())
+        return [self.index.get(song_id) for song_id in self.prefixes.search(prefix, limit)]
+    
+    # ------------------- POSITIONS (O(log n)) -------------------
+    
+    def _position_tree(self):
+        """Position tree, built from the list the first time it is needed"""
+        if self.positions is None:
+            self.positions = PositionTree.build(
+                (s.song_id, s, s.seconds) for s in self.iter_songs())
+        return self.positions
+    
+    def song_at(self, position):
+        """Song number `position` (0 = head)"""
+        return self._position_tree().song_at(position)
+    
+    def index_of(self, song):
+        """Position of `song` in the playlist (0 = head)"""
+        return self._position_tree().index_of(song.song_id)
+    
+    def insert_at(self, position, title, artist, duration):
+        """Insert a new song so it becomes number `position`"""
+        if not 0 <= position <= self.size:
+            raise IndexError(f"Cannot insert at position {position}")
+        
+        # 1. At the end (or empty list) = normal add
+        if position == self.size:
+            return self.add_song(title, artist, duration)
+        
+        # 2. Find the song BEFORE the new one and link after it
+        new_song = self.node_class(title, artist, duration)
+        before = self.song_at(position - 1) if position > 0 else None
+        self._link_after(before, new_song)
+        
+        # 3. Increase size
+        self.size += 1
+        self._song_added(new_song, position)
+        
+        return new_song
+    
+    def remove_at(self, position):
+        """Remove song number `position` and return it"""
+        song = self.song_at(position)
+        
+        # Removing the playing song moves the cursor like remove_current
+        if song is self.current:
+            self.remove_current()
+        else:
+            before = self.song_at(position - 1) if position > 0 else None
+            self._unlink(song, before)
+        
+        return song
+    
+    # ------------------- PLAYTIME (O(log n)) -------------------
+    
+    def song_at_time(self, seconds):
+        """(song, seconds into it) playing `seconds` after the head starts"""
+        return self._position_tree().at_time(seconds)
+    
+    def time_until(self, song, start=None):
+        """Seconds from the start of `start` (default: current song) until
+        `song` starts - None if playing forward never gets there"""
+        start = self.current if start is None else start
+        tree = self._position_tree()
+        seconds = tree.time_before(song.song_id) - tree.time_before(start.song_id)
+        if tree.index_of(song.song_id) < tree.index_of(start.song_id):
+            return self._time_around(seconds)
+        return seconds
+    
+    def _time_around(self, seconds):
+        """`song` is behind the start: a straight list never comes back"""
+        return None
+    
+    # ------------------- SHUFFLE -------------------
+    
+    def shuffle(self, rng=random, spread=False):
+        """Put the songs in random order by relinking the same nodes - O(n)
+        (spread=True: the same artist never plays twice in a row if avoidable)"""
+        if self.size < 2:
+            return
+        songs = list(self.iter_songs())     # References only - no song is copied
+        if spread:
+            songs = spread_artists(songs, rng)
+        else:
+            rng.shuffle(songs)
+        
+        # 1. New next pointers, head -> tail
+        self._open_ring()
+        for before, song in zip(songs, islice(songs, 1, None)):
+            before.next = song
+        songs[-1].next = None
+        self.head, self.tail = songs[0], songs[-1]
+        
+        # 2. prev pointers / ring like a type change; positions are rebuilt lazily
+        self._relink(False)
+        self.positions = None
+        position = songs.index(self.current)
+        self.before_current = songs[position - 1] if position else None
+    
+    def shuffled(self, rng=random):
+        """Yield every song once in random order - links are NOT touched
+        (one O(log n) position lookup per song; do not change the list meanwhile)"""
+        for position in random_order(self.size, rng):
+            yield self.song_at(position)
+    
+    # ------------------- UNDO SUPPORT (utils/history.py) -------------------
+    
+    def cut(self, song_id, before_id=None):
+        """Remove a song by id and return a hole that put_back() fills again
+        (`before_id` = song before it, if known - saves the search in a singly list)"""
+        song = self.index.get(song_id)
+        before = self._before(song) if before_id is None else self.index.get(before_id)
+        hole = (song, None if before is None else before.song_id)
+        if song is self.current:
+            self.remove_current()
+        else:
+            self._unlink(song, before)
+        return hole
+    
+    def put_back(self, hole, make_current=False):
+        """Undo cut(): the same node goes back after the same song - O(1)"""
+        song, before_id = hole
+        before = None if before_id is None else self.index.get(before_id)
+        if self.head is None:
+            self.head = self.tail = song
+            song.next = None
+            self.current = song
+            self._relink(False)         # prev / ring of a one-song list
+            self.before_current = None
+        else:
+            self._link_after(before, song)
+            if make_current:
+                self.current = song
+                self.before_current = before
+        
+        self.size += 1
+        position = None
+        if self.positions is not None:
+            position = 0 if before is None else self.positions.index_of(before_id) + 1
+        self._song_added(song, position, keep_id=True)
+        return song
+    
+    def _before(self, song):
+        """Song just before `song` (None for head) - walks only as a last resort"""
+        if song is self.head:
+            return None
+        if song is self.current:
+            return self.find_before_current()
+        if self.positions is not None:
+            return self.song_at(self.index_of(song) - 1)
+        before = self.head
+        while before.next is not song:
+            before = before.next
+        return before
+    
+    def detach_all(self):
+        """clear() in O(1) that hands the songs back for restore_all()
+        (nodes, index, stats and positions are kept as they are)"""
+        state = dict(vars(self))
+        self._current = None            # Keeps its "playing" mark for restore_all
+        self.index = SongIndex()
+        self.index.next_id = state["index"].next_id
+        self.stats = PlaylistStats()
+        self.clear()
+        return state
+    
+    def restore_all(self, state):
+        """Undo detach_all() - O(1), the playlist must be empty"""
+        state["index"].next_id = max(state["index"].next_id, self.index.next_id)
+        vars(self).update(state)
+    
+    # ------------------- STREAMING (NO LIST BUILT) -------------------
+    
+    def iter_songs(self):
+        """Yield every song once, head to tail (safe for circular too)"""
+        temp = self.head
+        for _ in range(self.size):
+            yield temp
+            temp = temp.next
+    
+    def iter_from(self, song, count):
+        """Yield up to `count` songs starting at `song`, stopping after tail"""
+        temp = song
+        while temp is not None and count > 0:
+            yield temp
+            if temp is self.tail:
+                break
+            temp = temp.next
+            count -= 1
+    
+    def iter_range(self, start, count):
+        """Yield songs number start .. start+count-1 (clipped to the list)"""
+        if count <= 0 or start >= self.size:
+            return
+        start = max(start, 0)
+        first = self.head if start == 0 else self.song_at(start)
+        yield from self.iter_from(first, count)
+    
     # ------------------- UTILITY METHODS -------------------
     
     def get_all_songs(self):
@@ -84,7 +538,6 @@ class SinglyLinkedList:
         temp = self.head
         
         while temp:
-            temp.is_current = (temp == self.current)
             songs.append(temp)
             temp = temp.next
             
@@ -95,7 +548,12 @@ class SinglyLinkedList:
         self.head = None
         self.tail = None
         self.current = None
+        self.before_current = None
         self.size = 0
+        self.index.clear()
+        self.positions = None
+        self.prefixes = None
+        self.stats.clear()
     
     def get_stats(self):
         """Get statistics about playlist"""
@@ -104,5 +562,19 @@ class SinglyLinkedList:
             "size": self.size,
             "current": self.current.title if self.current else "None",
             "head": self.head.title if self.head else "None",
-            "tail": self.tail.title if self.tail else "None"
+            "tail": self.tail.title if self.tail else "None",
+            # Nodes kept from a doubly list (converted in place) still have prev
+            "node_bytes": node_bytes(type(self.head) if self.head else self.node_class),
+            **self._running_stats(self.current.artist if self.current else None)
+        }
+    
+    def _running_stats(self, current_artist):
+        """Totals from the running aggregates - O(1), no walk"""
+        stats = self.stats
+        return {
+            "total_seconds": stats.total_seconds,
+            "artists": len(stats.artists),
+            "current_artist_songs": stats.songs_by(current_artist),
+            "shortest": stats.shortest,
+            "longest": stats.longest,
         }
@@ -0,0 +1,245 @@
+"""
+PLAYLIST SNAPSHOTS (BINARY FILE)
+Saves a whole playlist to one compact file and opens it again quickly.
+
+File layout (little-endian, version 1):
+    header        magic "PLSN", version, list type, song count,
+                  current song position, string count, string bytes
+    title ids     one uint32 per song  -> string table
+    artist ids    one uint32 per song  -> string table
+    seconds       one uint32 per song
+    offsets       one uint64 per string (+1): where each string starts
+    strings       all titles / artists as UTF-8, each stored once
+
+Opening maps the file into memory (mmap) instead of reading it:
+- "array" backend: the columns point straight into the file, a song's
+  text is only decoded when traversal or the display reaches it
+- "linked" backend: nodes are built in one bulk pass (add_songs)
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import Counter
+from itertools import accumulate, islice
+
+MAGIC = b"PLSN"
+VERSION = 1
+HEADER = struct.Struct("<4sHBxqqqq")
+LIST_TYPES = ["Singly Linked List", "Doubly Linked List", "Circular Linked List"]
+
+
+def _little_endian(column):
+    """Column as little-endian bytes (arrays use the machine's byte order)"""
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _padding(position):
+    """Zero bytes needed to reach the next multiple of 8"""
+    return b"\0" * (-position % 8)
+
+
+# ------------------- SAVE -------------------
+
+def save_snapshot(playlist, path):
+    """Write `playlist` to `path` - returns the number of songs saved"""
+    # 1. Songs -> three int columns + one table of distinct strings
+    strings = {}            # text -> string id
+    title_ids = array("I")
+    artist_ids = array("I")
+    seconds = array("I")
+    cursor = -1
+    for position, song in enumerate(playlist.iter_songs()):
+        title_ids.append(strings.setdefault(song.title, len(strings)))
+        artist_ids.append(strings.setdefault(song.artist, len(strings)))
+        seconds.append(song.seconds)
+        if playlist.is_playing(song):
+            cursor = position
+
+    encoded = [text.encode("utf-8") for text in strings]
+    offsets = array("Q", accumulate(map(len, encoded), initial=0))
+    columns = _little_endian(title_ids) + _little_endian(artist_ids) + _little_endian(seconds)
+
+    # 2. Write a temporary file and swap it in (an open snapshot of the same
+    #    path keeps its mapping of the old file)
+    header = HEADER.pack(MAGIC, VERSION, LIST_TYPES.index(playlist.list_type),
+                         len(seconds), cursor, len(encoded), offsets[-1])
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(header)
+        f.write(columns)
+        f.write(_padding(len(header) + len(columns)))
+        f.write(_little_endian(offsets))
+        f.write(b"".join(encoded))
+        f.flush()
+        os.fsync(f.fileno())    # On disk before it replaces anything (journal checkpoints)
+    os.replace(temporary, path)
+    return len(seconds)
+
+
+# ------------------- OPEN -------------------
+
+class StringTable:
+    """Strings of a snapshot, decoded one at a time when asked for"""
+
+    def __init__(self, buffer, offsets, start):
+        self.buffer = buffer
+        self.offsets = offsets          # uint64 per string (+1)
+        self.start = start              # Where the UTF-8 bytes begin
+        self.interned = {}              # Artist strings, shared like add_song does
+
+    def __getitem__(self, string_id):
+        begin = self.start + self.offsets[string_id]
+        end = self.start + self.offsets[string_id + 1]
+        return str(self.buffer[begin:end], "utf-8")
+
+    def artist(self, string_id):
+        text = self.interned.get(string_id)
+        if text is None:
+            text = self.interned[string_id] = sys.intern(self[string_id])
+        return text
+
+
+class MappedStrings:
+    """List-like text column: rows from the file are decoded on access,
+    changed and appended rows live in ordinary Python objects"""
+
+    def __init__(self, ids, lookup):
+        self.ids = ids                  # uint32 string id per mapped row
+        self.lookup = lookup            # string id -> text
+        self.mapped = len(ids)
+        self.changed = {}               # Overwritten mapped rows
+        self.extra = []                 # Rows appended after opening
+
+    def __len__(self):
+        return self.mapped + len(self.extra)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(self)))]
+        if row >= self.mapped:
+            return self.extra[row - self.mapped]
+        if row in self.changed:
+            return self.changed[row]
+        return self.lookup(self.ids[row])
+
+    def __setitem__(self, row, text):
+        if row >= self.mapped:
+            self.extra[row - self.mapped] = text
+        else:
+            self.changed[row] = text
+
+    def append(self, text):
+        self.extra.append(text)
+
+
+class Snapshot:
+    """An opened snapshot file (memory-mapped, nothing decoded up front)"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            try:
+                self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:              # Empty file
+                raise ValueError(f"{path} is not a playlist snapshot") from None
+
+        # 1. Header
+        if len(self.buffer) < HEADER.size:
+            raise ValueError(f"{path} is not a playlist snapshot")
+        magic, version, type_code, size, cursor, string_count, string_bytes = \
+            HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a playlist snapshot")
+        if version != VERSION or type_code >= len(LIST_TYPES):
+            raise ValueError(f"{path}: unsupported snapshot version {version}")
+        self.list_type = LIST_TYPES[type_code]
+        self.size = size
+        self.cursor = cursor
+
+        # 2. Sections (checked against the real file size before use)
+        columns = HEADER.size
+        offsets = columns + 12 * size
+        offsets += -offsets % 8
+        strings = offsets + 8 * (string_count + 1)
+        if strings + string_bytes != len(self.buffer):
+            raise ValueError(f"{path}: snapshot is damaged (wrong size)")
+
+        view = memoryview(self.buffer)
+        self.title_ids = self._column(view[columns:columns + 4 * size], "I")
+        self.artist_ids = self._column(view[columns + 4 * size:columns + 8 * size], "I")
+        self.seconds_bytes = view[columns + 8 * size:columns + 12 * size]
+        self.seconds_column = self._column(self.seconds_bytes, "I")
+        self.strings = StringTable(self.buffer, self._column(view[offsets:strings], "Q"), strings)
+
+    @staticmethod
+    def _column(view, typecode):
+        """Read-only int column straight from the file (copied on big-endian)"""
+        if sys.byteorder == "little":
+            return view.cast(typecode)
+        column = array(typecode)
+        column.frombytes(view)
+        column.byteswap()
+        return column
+
+    def __len__(self):
+        return self.size
+
+    def song(self, position):
+        """(title, artist, seconds) of song number `position`"""
+        return (self.strings[self.title_ids[position]],
+                self.strings.artist(self.artist_ids[position]),
+                self.seconds_column[position])
+
+    def __iter__(self):
+        for position in range(self.size):
+            yield self.song(position)
+
+    def seconds(self):
+        """Durations as an ordinary (writable) array - one bulk copy"""
+        column = array("I")
+        column.frombytes(self.seconds_bytes)
+        if sys.byteorder == "big":
+            column.byteswap()
+        return column
+
+    # ------------------- PLAYLISTS -------------------
+
+    def to_array_playlist(self):
+        """ArrayPlaylist whose text columns read from the mapped file"""
+        from data_structures import ArrayPlaylist
+
+        # Songs per artist counted on the ids (C speed), only names decoded
+        artist_counts = {self.strings.artist(string_id): count
+                         for string_id, count in Counter(self.artist_ids).items()}
+        return ArrayPlaylist.from_columns(
+            self.list_type,
+            MappedStrings(self.title_ids, self.strings.__getitem__),
+            MappedStrings(self.artist_ids, self.strings.artist),
+            self.seconds(),
+            self.cursor,
+            artist_counts)
+
+    def to_linked_playlist(self):
+        """Linked list of the saved type, built in one bulk pass"""
+        from utils.helpers import new_playlist
+        playlist = new_playlist(self.list_type, "linked")
+        songs = iter(self)
+
+        # Songs before the saved current one, the current one, then the rest
+        if 0 <= self.cursor < self.size:
+            playlist.add_songs(islice(songs, self.cursor))
+            playlist.current = playlist.add_song(*next(songs))
+        playlist.add_songs(songs)
+        return playlist
+
+
+def load_snapshot(path, backend="linked"):
+    """Open a snapshot as a playlist ("linked" nodes or "array" columns)"""
+    snapshot = Snapshot(path)
+    if backend == "array":
+        return snapshot.to_array_playlist()
+    return snapshot.to_linked_playlist()
@@ -0,0 +1,92 @@
+"""
+SONG INDEX (HASH TABLES)
+Finds songs without walking the list:
+- song id  -> song
+- title    -> all songs with that title  (duplicates allowed)
+- artist   -> all songs by that artist
+Every lookup / update is O(1) on average.
+"""
+
+
+class SongIndex:
+    def __init__(self):
+        self.next_id = 1        # Ids are never reused
+        self.by_id = {}         # id -> song
+        self.by_title = {}      # title -> {id: song}  (keeps add order)
+        self.by_artist = {}     # artist -> {id: song}
+
+    def new_id(self):
+        """Hand out the next stable song id"""
+        song_id = self.next_id
+        self.next_id += 1
+        return song_id
+
+    def add(self, song_id, title, artist, song):
+        """Register a song (song = node, or row number for arrays)"""
+        self.by_id[song_id] = song
+        self.by_title.setdefault(title, {})[song_id] = song
+        self.by_artist.setdefault(artist, {})[song_id] = song
+
+    def add_many(self, songs):
+        """Register many (title, artist, song) at once - returns their ids"""
+        by_id, by_title, by_artist = self.by_id, self.by_title, self.by_artist
+        first_id = song_id = self.next_id
+        for title, artist, song in songs:
+            by_id[song_id] = song
+            bucket = by_title.get(title)
+            if bucket is None:
+                by_title[title] = {song_id: song}
+            else:
+                bucket[song_id] = song
+            bucket = by_artist.get(artist)
+            if bucket is None:
+                by_artist[artist] = {song_id: song}
+            else:
+                bucket[song_id] = song
+            song_id += 1
+        self.next_id = song_id
+        return range(first_id, song_id)
+
+    def remove(self, song_id, title, artist):
+        """Forget a song"""
+        self.by_id.pop(song_id, None)
+        for table, key in ((self.by_title, title), (self.by_artist, artist)):
+            bucket = table.get(key)
+            if bucket is not None:
+                bucket.pop(song_id, None)
+                if not bucket:
+                    del table[key]
+
+    def clear(self):
+        """Forget everything (ids keep counting up)"""
+        self.by_id = {}
+        self.by_title = {}
+        self.by_artist = {}
+
+    def get(self, song_id):
+        """Song with this id (or None)"""
+        return self.by_id.get(song_id)
+
+    def first(self, title=None, artist=None):
+        """Oldest song matching title and/or artist (or None)"""
+        if artist is None:
+            bucket = self.by_title.get(title, {})
+            return next(iter(bucket.values()), None)
+        matches = self.find(title, artist)
+        return matches[0] if matches else None
+
+    def find(self, title=None, artist=None):
+        """All songs matching title and/or artist, oldest first"""
+        if title is None and artist is None:
+            return []
+        if title is None:
+            return list(self.by_artist.get(artist, {}).values())
+        if artist is None:
+            return list(self.by_title.get(title, {}).values())
+
+        # Both given: scan the smaller bucket, check the other
+        titled = self.by_title.get(title, {})
+        by_artist = self.by_artist.get(artist, {})
+        if len(titled) <= len(by_artist):
+            return [song for song_id, song in titled.items() if song_id in by_artist]
+        return [song for song_id, song in by_artist.items() if song_id in titled]